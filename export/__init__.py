@@ -1,5 +1,12 @@
-from export.hf_upload import upload_dataset
+from export.hf_upload import upload_dataset, upload_dataset_files
+from export.sharded import ShardedWriter
 from export.to_jsonl import export_jsonl
 from export.to_parquet import export_parquet
 
-__all__ = ["export_jsonl", "export_parquet", "upload_dataset"]
+__all__ = [
+    "ShardedWriter",
+    "export_jsonl",
+    "export_parquet",
+    "upload_dataset",
+    "upload_dataset_files",
+]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from pathlib import Path
 from typing import Dict, List
 
 from datasets import Dataset, DatasetDict
@@ -12,3 +13,19 @@ def upload_dataset(splits: Dict[str, List[dict]], repo_name: str, private: bool,
 
     logger.info("Uploading dataset to Hugging Face: %s", repo_name)
     dataset.push_to_hub(repo_name, private=private)
+
+
+def upload_dataset_files(
+    data_files: Dict[str, List[Path]], repo_name: str, private: bool, logger
+) -> None:
+    files = {split: [str(path) for path in paths] for split, paths in data_files.items() if paths}
+    if not files:
+        logger.warning("No exported files to upload for %s", repo_name)
+        return
+    paths = [path for split_files in files.values() for path in split_files]
+    parquet = all(path.endswith(".parquet") for path in paths)
+    reader = Dataset.from_parquet if parquet else Dataset.from_json
+    dataset = DatasetDict({split: reader(split_files) for split, split_files in files.items()})
+
+    logger.info("Uploading dataset to Hugging Face: %s", repo_name)
+    dataset.push_to_hub(repo_name, private=private)
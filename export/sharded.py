@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import gzip
+import json
+from pathlib import Path
+from typing import IO, Dict, Iterable, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+
+PARQUET_BATCH_SIZE = 1000
+
+
+class ShardedWriter:
+    def __init__(
+        self,
+        output_dir: Path,
+        name: str,
+        formats: Iterable[str] = ("jsonl",),
+        compression: Optional[str] = None,
+        shard_size: int = 100_000,
+        append: bool = False,
+    ) -> None:
+        self.output_dir = output_dir
+        self.name = name
+        self.formats = set(formats)
+        self.compression = compression
+        self.shard_size = shard_size
+        self.count = 0
+        self.files: Dict[str, List[Path]] = {fmt: [] for fmt in self.formats}
+        if "parquet" in self.formats and pq is None:
+            raise RuntimeError("pyarrow is required for Parquet export")
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._first_index = 0
+        existing = sorted(self.output_dir.glob(f"{name}-[0-9][0-9][0-9][0-9][0-9].*"))
+        if append:
+            # Incremental runs add shards after the existing ones and report all of them.
+            for path in existing:
+                fmt = "parquet" if path.suffix == ".parquet" else "jsonl"
+                if fmt in self.files:
+                    self.files[fmt].append(path)
+            indices = [int(path.name[len(name) + 1 :][:5]) for path in existing]
+            self._first_index = max(indices, default=-1) + 1
+        else:
+            for stale in existing:
+                stale.unlink()
+        self._existing = {fmt: len(paths) for fmt, paths in self.files.items()}
+        self._shard_rows = 0
+        self._jsonl: Optional[IO[str]] = None
+        self._parquet: Optional[pq.ParquetWriter] = None
+        self._schema = None
+        self._rows: List[Dict] = []
+
+    def _shard_path(self, suffix: str) -> Path:
+        fmt = "jsonl" if suffix.startswith(".jsonl") else "parquet"
+        index = self._first_index + len(self.files[fmt]) - self._existing[fmt]
+        return self.output_dir / f"{self.name}-{index:05d}{suffix}"
+
+    def _open_jsonl(self) -> IO[str]:
+        if self.compression == "gzip":
+            path = self._shard_path(".jsonl.gz")
+            handle = gzip.open(path, "wt", encoding="utf-8")
+        else:
+            path = self._shard_path(".jsonl")
+            handle = path.open("w", encoding="utf-8")
+        self.files["jsonl"].append(path)
+        return handle
+
+    def _flush_parquet(self) -> None:
+        if not self._rows:
+            return
+        if self._schema is None:
+            inferred = pa.Table.from_pylist(self._rows).schema
+            self._schema = pa.schema(
+                [
+                    pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field
+                    for field in inferred
+                ]
+            )
+        if self._parquet is None:
+            path = self._shard_path(".parquet")
+            self._parquet = pq.ParquetWriter(
+                path, self._schema, compression=self.compression or "none"
+            )
+            self.files["parquet"].append(path)
+        self._parquet.write_table(pa.Table.from_pylist(self._rows, schema=self._schema))
+        self._rows = []
+
+    def _close_shard(self) -> None:
+        if self._jsonl is not None:
+            self._jsonl.close()
+            self._jsonl = None
+        if "parquet" in self.formats:
+            self._flush_parquet()
+            if self._parquet is not None:
+                self._parquet.close()
+                self._parquet = None
+        self._shard_rows = 0
+
+    def write(self, item: Dict) -> None:
+        if "jsonl" in self.formats:
+            if self._jsonl is None:
+                self._jsonl = self._open_jsonl()
+            self._jsonl.write(json.dumps(item, ensure_ascii=False) + "\n")
+        if "parquet" in self.formats:
+            self._rows.append(item)
+            if len(self._rows) >= PARQUET_BATCH_SIZE:
+                self._flush_parquet()
+        self.count += 1
+        self._shard_rows += 1
+        if self._shard_rows >= self.shard_size:
+            self._close_shard()
+
+    def close(self) -> Dict[str, List[Path]]:
+        self._close_shard()
+        return self.files
@@ -1,14 +1,23 @@
-from processing.cleaning import clean_document, passes_quality_checks
-from processing.deduplication import deduplicate_documents
-from processing.language_check import validate_language
+from processing.cleaning import clean_document, compile_cleaner, passes_quality_checks
+from processing.deduplication import deduplicate_documents, iter_deduplicated
+from processing.language_check import LanguageCheck, validate_language, validate_languages
 from processing.normalization import normalize_document
-from processing.splitting import split_dataset
+from processing.pipeline import process_chunk, process_document, process_documents
+from processing.splitting import split_dataset, split_for
 
 __all__ = [
+    "LanguageCheck",
     "clean_document",
+    "compile_cleaner",
     "deduplicate_documents",
+    "iter_deduplicated",
     "normalize_document",
     "passes_quality_checks",
+    "process_chunk",
+    "process_document",
+    "process_documents",
     "split_dataset",
+    "split_for",
     "validate_language",
+    "validate_languages",
 ]
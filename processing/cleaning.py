@@ -1,32 +1,111 @@
 from __future__ import annotations
 
-from typing import Dict, List
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from utils.text_utils import (
-    anonymize_text,
-    contains_pii,
-    digit_ratio,
-    special_char_ratio,
-    word_count,
-)
+from utils.text_utils import TextStats, anonymize_text, text_stats
 
 
-def _remove_patterns(text: str, patterns: List[str]) -> str:
-    for pattern in patterns:
-        text = text.replace(pattern, "")
-    return text
+REGEX_PREFIX = "regex:"
+LINE_PREFIX = "line:"
+
+
+@dataclass(frozen=True)
+class Cleaner:
+    boilerplate: Tuple[re.Pattern, ...] = ()
+
+    def clean(self, text: str) -> str:
+        for pattern in self.boilerplate:
+            text = pattern.sub("", text)
+        return anonymize_text(text).strip()
+
+
+def _trie_regex(literals: Sequence[str]) -> str:
+    # A prefix trie rendered as nested alternations, so hundreds of literals cost one scan.
+    trie: Dict[str, Dict] = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict[str, Dict]) -> str:
+        leaves: List[str] = []
+        branches: List[str] = []
+        for char in sorted(key for key in node if key):
+            child = node[char]
+            if list(child) == [""]:
+                leaves.append(re.escape(char))
+            else:
+                branches.append(re.escape(char) + render(child))
+        if leaves:
+            branches.append(leaves[0] if len(leaves) == 1 else f"[{''.join(leaves)}]")
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # Greedy optional: the longer literal wins over one that is its prefix.
+        return f"(?:{body})?" if "" in node else body
+
+    return render(trie)
+
+
+def _pattern_regex(pattern: str) -> str:
+    if pattern.startswith(LINE_PREFIX):
+        # The whole line, including its newline, goes when its content matches.
+        return rf"(?m:^[ \t]*(?:{pattern[len(LINE_PREFIX):]})[ \t]*(?:\n|$))"
+    return f"(?:{pattern[len(REGEX_PREFIX):]})"
+
+
+@lru_cache(maxsize=32)
+def _compile_cleaner(patterns: Sequence[str]) -> Cleaner:
+    prefixes = (LINE_PREFIX, REGEX_PREFIX)
+    literals = [pattern for pattern in patterns if pattern and not pattern.startswith(prefixes)]
+    # Line patterns go first so they claim whole lines before a literal eats part of one.
+    expressions = sorted(
+        (pattern for pattern in patterns if pattern.startswith(prefixes)),
+        key=lambda pattern: not pattern.startswith(LINE_PREFIX),
+    )
+    regexes: List[str] = []
+    separate: List[re.Pattern] = []
+    for pattern in expressions:
+        regex = _pattern_regex(pattern)
+        try:
+            compiled = re.compile(regex)
+        except re.error as exc:
+            raise ValueError(f"invalid exclude pattern {pattern!r}: {exc}") from exc
+        # Joined patterns share one group namespace: named groups could clash and numbered
+        # backreferences would point at another pattern's group, so these stay on their own.
+        if compiled.groups:
+            separate.append(compiled)
+        else:
+            regexes.append(regex)
+    if literals:
+        regexes.append(_trie_regex(literals))
+    if not regexes:
+        return Cleaner(boilerplate=tuple(separate))
+    try:
+        combined = [re.compile("|".join(regexes))]
+    except re.error:
+        combined = [re.compile(regex) for regex in regexes]
+    return Cleaner(boilerplate=tuple(combined + separate))
+
+
+def compile_cleaner(config: Dict) -> Cleaner:
+    return _compile_cleaner(tuple(config.get("exclude_patterns") or ()))
 
 
 def clean_document(text: str, config: Dict) -> str:
-    patterns = config.get("exclude_patterns", [])
-    if patterns:
-        text = _remove_patterns(text, patterns)
-    if contains_pii(text):
-        text = anonymize_text(text)
-    return text.strip()
+    return compile_cleaner(config).clean(text)
 
 
-def passes_quality_checks(text: str, cleaning_config: Dict, quality_config: Dict) -> bool:
+def passes_quality_checks(
+    text: str,
+    cleaning_config: Dict,
+    quality_config: Dict,
+    stats: Optional[TextStats] = None,
+) -> bool:
     if not text:
         return False
     min_length = cleaning_config.get("min_length", 0)
@@ -34,17 +113,17 @@ def passes_quality_checks(text: str, cleaning_config: Dict, quality_config: Dict
     if len(text) < min_length or len(text) > max_length:
         return False
 
+    stats = stats or text_stats(text)
     min_words = quality_config.get("min_words_per_document", 0)
     max_words = quality_config.get("max_words_per_document", 10**9)
-    count = word_count(text)
-    if count < min_words or count > max_words:
+    if stats.words < min_words or stats.words > max_words:
         return False
 
     max_digit_ratio = quality_config.get("max_digit_ratio")
-    if max_digit_ratio is not None and digit_ratio(text) > max_digit_ratio:
+    if max_digit_ratio is not None and stats.digit_ratio > max_digit_ratio:
         return False
 
     max_special_ratio = quality_config.get("max_special_char_ratio")
-    if max_special_ratio is not None and special_char_ratio(text) > max_special_ratio:
+    if max_special_ratio is not None and stats.special_char_ratio > max_special_ratio:
         return False
     return True
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from typing import Dict, Iterable, List
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
 
-from utils.hashing import compute_minhash, sha256_text
+from utils.hashing import compute_minhash, sha256_digest64
 from utils.text_utils import tokenize_for_minhash
 
 try:
@@ -11,24 +11,30 @@ except ImportError:  # pragma: no cover - optional dependency
     MinHashLSH = None
 
 
-def _dedup_sha256(documents: Iterable[Dict]) -> List[Dict]:
+def _dedup_sha256(
+    documents: Iterable[Dict], on_duplicate: Optional[Callable[[Dict], None]] = None
+) -> Iterator[Dict]:
     seen = set()
-    unique_docs: List[Dict] = []
     for doc in documents:
-        digest = sha256_text(doc["text"])
+        digest = sha256_digest64(doc["text"])
         if digest in seen:
+            if on_duplicate:
+                on_duplicate(doc)
             continue
         seen.add(digest)
-        unique_docs.append(doc)
-    return unique_docs
+        yield doc
 
 
-def _dedup_minhash(documents: Iterable[Dict], threshold: float, num_perm: int) -> List[Dict]:
+def _dedup_minhash(
+    documents: Iterable[Dict],
+    threshold: float,
+    num_perm: int,
+    on_duplicate: Optional[Callable[[Dict], None]] = None,
+) -> Iterator[Dict]:
     if MinHashLSH is None:
         raise RuntimeError("datasketch is required for MinHash deduplication")
 
     lsh = MinHashLSH(threshold=threshold, num_perm=num_perm)
-    unique_docs: List[Dict] = []
 
     for idx, doc in enumerate(documents):
         tokens = list(tokenize_for_minhash(doc["text"]))
@@ -36,24 +42,35 @@ def _dedup_minhash(documents: Iterable[Dict], threshold: float, num_perm: int) -
             continue
         minhash = compute_minhash(tokens, num_perm=num_perm)
         if lsh.query(minhash):
+            if on_duplicate:
+                on_duplicate(doc)
             continue
         key = f"doc-{idx}"
         lsh.insert(key, minhash)
-        unique_docs.append(doc)
-    return unique_docs
+        yield doc
 
 
-def deduplicate_documents(documents: Iterable[Dict], config: Dict, logger) -> List[Dict]:
-    deduped = list(documents)
+def iter_deduplicated(
+    documents: Iterable[Dict],
+    config: Dict,
+    logger,
+    on_duplicate: Optional[Callable[[Dict], None]] = None,
+) -> Iterator[Dict]:
+    deduped: Iterable[Dict] = documents
     if config.get("use_sha256", True):
-        deduped = _dedup_sha256(deduped)
+        deduped = _dedup_sha256(deduped, on_duplicate)
     if config.get("use_minhash", False):
-        try:
+        if MinHashLSH is None:
+            logger.warning("MinHash dedup skipped: datasketch is required for MinHash deduplication")
+        else:
             deduped = _dedup_minhash(
                 deduped,
                 threshold=config.get("minhash_threshold", 0.9),
                 num_perm=config.get("minhash_num_perm", 128),
+                on_duplicate=on_duplicate,
             )
-        except RuntimeError as exc:
-            logger.warning("MinHash dedup skipped: %s", exc)
-    return deduped
+    return iter(deduped)
+
+
+def deduplicate_documents(documents: Iterable[Dict], config: Dict, logger) -> List[Dict]:
+    return list(iter_deduplicated(documents, config, logger))
@@ -1,7 +1,15 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from functools import lru_cache
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence, Set
+
+from processing.language_prefilter import (
+    MARKERS,
+    PrefilterModel,
+    load_prefilter,
+    prefilter_language,
+)
 
 try:
     import fasttext
@@ -9,6 +17,21 @@ except ImportError:  # pragma: no cover - optional dependency
     fasttext = None
 
 
+DEFAULT_MAX_CHARS = 2000
+DEFAULT_WINDOWS = 3
+DEFAULT_PREFILTER_CONFIDENCE = 0.98
+
+_warned: Set[str] = set()
+
+
+@dataclass(frozen=True)
+class LanguageCheck:
+    passed: bool
+    predicted: Optional[str] = None
+    confidence: float = 0.0
+    method: Optional[str] = None
+
+
 @lru_cache(maxsize=1)
 def _load_fasttext(model_path: str):
     if fasttext is None:
@@ -16,31 +39,129 @@ def _load_fasttext(model_path: str):
     return fasttext.load_model(model_path)
 
 
-def validate_language(document: Dict, config: Dict, logger) -> bool:
-    if not config.get("use_fasttext_validation", False):
-        return True
+def _warn_once(logger, message: str, *args) -> None:
+    key = message % args
+    if key not in _warned:
+        _warned.add(key)
+        logger.warning(message, *args)
+
 
+def _language_model(config: Dict, logger):
+    if not config.get("use_fasttext_validation", False):
+        return None
     model_path = config.get("fasttext_model_path")
     if not model_path:
-        logger.warning("FastText model path not set; skipping validation")
-        return True
+        _warn_once(logger, "FastText model path not set; skipping validation")
+        return None
+    try:
+        return _load_fasttext(model_path)
+    except (RuntimeError, ValueError) as exc:
+        _warn_once(logger, "FastText validation skipped: %s", exc)
+        return None
 
+
+def _prefilter_model(config: Dict, logger) -> Optional[PrefilterModel]:
+    model_path = config.get("prefilter_model_path")
+    if not model_path:
+        return None
     try:
-        model = _load_fasttext(model_path)
-    except RuntimeError as exc:
-        logger.warning("FastText validation skipped: %s", exc)
-        return True
-
-    text = document.get("text", "")
-    if not text:
-        return False
-    labels, probabilities = model.predict(text.replace("\n", " "), k=1)
-    if not labels:
-        return False
-    predicted = labels[0].replace("__label__", "")
-    confidence = probabilities[0] if probabilities else 0.0
-    expected = document.get("language")
+        return load_prefilter(model_path)
+    except (OSError, KeyError, ValueError) as exc:
+        _warn_once(logger, "Prefilter model unusable, using lexical markers: %s", exc)
+        return None
+
+
+def preload_language_model(config: Dict, logger) -> None:
+    if config.get("use_prefilter", False):
+        # fastText is only loaded once a document escalates past the prefilter.
+        _prefilter_model(config, logger)
+        return
+    _language_model(config, logger)
+
+
+def prediction_text(
+    text: str, max_chars: Optional[int] = DEFAULT_MAX_CHARS, windows: int = DEFAULT_WINDOWS
+) -> str:
+    # fastText predicts one line at a time; long bodies are scored on evenly spaced windows.
+    # A null or zero max_chars scores the whole document.
+    if max_chars and len(text) > max_chars:
+        windows = min(max(windows, 1), max_chars)
+        width = max_chars // windows
+        step = (len(text) - width) // max(windows - 1, 1)
+        parts = []
+        for index in range(windows):
+            window = text[index * step : index * step + width]
+            if index:
+                window = window.partition(" ")[2] or window
+            parts.append(window.rpartition(" ")[0] or window)
+        text = " ".join(parts)
+    return text.replace("\n", " ")
+
+
+def _prefilter_checks(
+    documents: Sequence[Dict], texts: Dict[int, str], config: Dict, logger
+) -> Dict[int, LanguageCheck]:
+    model = _prefilter_model(config, logger)
+    labels = set(model.labels if model is not None else MARKERS)
+    min_confidence = config.get("prefilter_min_confidence", DEFAULT_PREFILTER_CONFIDENCE)
+    settled: Dict[int, LanguageCheck] = {}
+    for index, text in texts.items():
+        expected = documents[index].get("language")
+        if expected not in labels:
+            continue
+        result = prefilter_language(text, model)
+        # The prefilter only confirms the assigned language; any disagreement goes to fastText.
+        if result is None or result[0] != expected or result[1] < min_confidence:
+            continue
+        settled[index] = LanguageCheck(
+            passed=True, predicted=result[0], confidence=result[1], method="prefilter"
+        )
+    return settled
+
+
+def validate_languages(documents: Sequence[Dict], config: Dict, logger) -> List[LanguageCheck]:
+    use_prefilter = config.get("use_prefilter", False)
+    if not use_prefilter and not config.get("use_fasttext_validation", False):
+        return [LanguageCheck(passed=True) for _ in documents]
+
+    max_chars = config.get("fasttext_max_chars", DEFAULT_MAX_CHARS)
+    windows = config.get("fasttext_windows", DEFAULT_WINDOWS)
+    results = [LanguageCheck(passed=False) for _ in documents]
+    texts = {
+        index: prediction_text(doc["text"], max_chars, windows)
+        for index, doc in enumerate(documents)
+        if doc.get("text")
+    }
+    if use_prefilter:
+        for index, check in _prefilter_checks(documents, texts, config, logger).items():
+            results[index] = check
+            del texts[index]
+    if not texts:
+        return results
+
+    model = _language_model(config, logger)
+    if model is None:
+        for index in texts:
+            results[index] = LanguageCheck(passed=True)
+        return results
+
     min_confidence = config.get("min_confidence_for_override", 0.95)
-    if predicted != expected and confidence >= min_confidence:
-        return False
-    return True
+    indices = list(texts)
+    labels, probabilities = model.predict([texts[index] for index in indices], k=1)
+    for index, doc_labels, doc_probabilities in zip(indices, labels, probabilities):
+        if not len(doc_labels):
+            continue
+        predicted = doc_labels[0].replace("__label__", "")
+        confidence = float(doc_probabilities[0]) if len(doc_probabilities) else 0.0
+        expected = documents[index].get("language")
+        results[index] = LanguageCheck(
+            passed=predicted == expected or confidence < min_confidence,
+            predicted=predicted,
+            confidence=confidence,
+            method="fasttext",
+        )
+    return results
+
+
+def validate_language(document: Dict, config: Dict, logger) -> bool:
+    return validate_languages([document], config, logger)[0].passed
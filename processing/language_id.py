@@ -2,11 +2,10 @@ from __future__ import annotations
 
 import random
 import re
-import string
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, List, Optional
 from uuid import uuid4
 
-from utils.text_utils import digit_ratio, word_count
+from utils.text_utils import TextStats, text_stats
 
 
 SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
@@ -33,17 +32,14 @@ def assign_length_bucket(text: str, buckets: Dict[str, Dict[str, int]]) -> Optio
 
 
 def punctuation_ratio(text: str) -> float:
-    if not text:
-        return 0.0
-    punctuation = sum(char in string.punctuation for char in text)
-    return punctuation / len(text)
+    return text_stats(text).punctuation_ratio
 
 
-def passes_quality_filters(text: str, config: Dict) -> bool:
+def passes_quality_filters(text: str, config: Dict, stats: Optional[TextStats] = None) -> bool:
+    stats = stats or text_stats(text)
     min_words = config.get("min_words", 0)
     max_words = config.get("max_words", 10**9)
-    count = word_count(text)
-    if count < min_words or count > max_words:
+    if stats.words < min_words or stats.words > max_words:
         return False
 
     reject_patterns = config.get("reject_if_contains", [])
@@ -52,11 +48,11 @@ def passes_quality_filters(text: str, config: Dict) -> bool:
             return False
 
     max_digit_ratio = config.get("max_digit_ratio")
-    if max_digit_ratio is not None and digit_ratio(text) > max_digit_ratio:
+    if max_digit_ratio is not None and stats.digit_ratio > max_digit_ratio:
         return False
 
     max_punctuation_ratio = config.get("max_punctuation_ratio")
-    if max_punctuation_ratio is not None and punctuation_ratio(text) > max_punctuation_ratio:
+    if max_punctuation_ratio is not None and stats.punctuation_ratio > max_punctuation_ratio:
         return False
 
     return True
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import re
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+NGRAM_ORDERS = (1, 2, 3, 4)
+NUM_BUCKETS = 1 << 18
+HASH_PRIME = np.uint64(0x100000001B3)
+WORD_SEED = 0x9E3779B9
+MIN_CYRILLIC_SHARE = 0.5
+MIN_MARKER_HITS = 3
+
+WORD_RE = re.compile(r"[^\W\d_]+")
+CYRILLIC_RE = re.compile(r"[Ѐ-ӿ]")
+# Serbian Cyrillic letters absent from Russian, and letters Serbian does not use
+# (Russian, Macedonian, Ukrainian, Belarusian).
+SERBIAN_CYRILLIC = frozenset("ђћџљњј")
+NON_SERBIAN_CYRILLIC = frozenset("ыэщъёѓќѕїєґў")
+CYRILLIC_LETTERS = "абвгдђежзијклљмнњопрстћуфхцчџш"
+LATIN_LETTERS = "a b v g d đ e ž z i j k l lj m n nj o p r s t ć u f h c č dž š".split()
+CYRILLIC_TO_LATIN = str.maketrans(dict(zip(CYRILLIC_LETTERS, LATIN_LETTERS)))
+
+# Used only when no trained model is configured: ekavian forms and Serbian vocabulary,
+# Croatian vocabulary and month names, and a few Bosnian-only words.
+MARKERS: Dict[str, frozenset] = {
+    "sr": frozenset(
+        "gde ovde posle uvek vreme vremena deca dete mleko lepo reka nedelja pesma ceo "
+        "hleb istorija takođe saopštio saopštenje univerzitet fudbal".split()
+    ),
+    "hr": frozenset(
+        "tko tjedan tjedna tisuća kruh glazba nogomet sveučilište povijest zrakoplov "
+        "kazalište točno tijekom sustav obitelj priopćio europski siječnja veljače ožujka "
+        "travnja svibnja lipnja srpnja kolovoza rujna listopada studenoga prosinca".split()
+    ),
+    "bs": frozenset("historija historije historijski hljeb lahko kahva sahat mahala".split()),
+}
+
+
+@dataclass(frozen=True)
+class PrefilterModel:
+    labels: Tuple[str, ...]
+    log_probs: np.ndarray
+    # Held-out accuracy of decisions whose margin is at least the matching threshold.
+    thresholds: np.ndarray
+    accuracy: np.ndarray
+
+    def margin(self, text: str) -> Tuple[str, float]:
+        ids = feature_ids(text)
+        if not len(ids):
+            return self.labels[0], 0.0
+        # Row-wise take is several times faster than fancy-indexing the whole matrix.
+        scores = np.array([row.take(ids).sum() for row in self.log_probs]) / len(ids)
+        order = np.argsort(scores)[::-1]
+        return self.labels[order[0]], float(scores[order[0]] - scores[order[1]])
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        label, margin = self.margin(text)
+        if not len(self.thresholds):
+            return label, 0.0
+        return label, float(np.interp(margin, self.thresholds, self.accuracy))
+
+
+def _latin_words(text: str) -> List[str]:
+    text = text.lower()
+    if CYRILLIC_RE.search(text):
+        text = text.translate(CYRILLIC_TO_LATIN)
+    return WORD_RE.findall(text)
+
+
+def feature_ids(text: str) -> np.ndarray:
+    words = _latin_words(text)
+    padded = f" {' '.join(words)} "
+    codes = np.frombuffer(padded.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    word_hashes = [zlib.crc32(word.encode("utf-8")) ^ WORD_SEED for word in words]
+    hashes = [np.array(word_hashes, dtype=np.uint64)]
+    for order in NGRAM_ORDERS:
+        count = len(codes) - order + 1
+        if count <= 0:
+            continue
+        # FNV-style rolling hash; uint64 arithmetic wraps, keeping ids stable across processes.
+        value = np.full(count, order, dtype=np.uint64)
+        for offset in range(order):
+            value = (value * HASH_PRIME) ^ codes[offset : offset + count]
+        hashes.append(value)
+    return (np.concatenate(hashes) % NUM_BUCKETS).astype(np.int64)
+
+
+def count_features(texts: Iterable[str]) -> np.ndarray:
+    counts = np.zeros(NUM_BUCKETS, dtype=np.float64)
+    for text in texts:
+        counts += np.bincount(feature_ids(text), minlength=NUM_BUCKETS)
+    return counts
+
+
+def fit_prefilter(counts: Dict[str, np.ndarray], alpha: float = 0.5) -> PrefilterModel:
+    labels = tuple(sorted(counts))
+    if len(labels) < 2:
+        raise ValueError("the prefilter needs documents for at least two languages")
+    matrix = np.stack([counts[label] for label in labels]) + alpha
+    log_probs = np.log(matrix / matrix.sum(axis=1, keepdims=True)).astype(np.float32)
+    return PrefilterModel(labels, log_probs, np.array([]), np.array([]))
+
+
+def calibrate_prefilter(
+    model: PrefilterModel, samples: Sequence[Tuple[str, str]], points: int = 50
+) -> PrefilterModel:
+    predictions = [model.margin(text) for _, text in samples]
+    margins = np.array([margin for _, margin in predictions])
+    correct = np.array(
+        [label == predicted for (label, _), (predicted, _) in zip(samples, predictions)]
+    )
+    if not len(margins):
+        raise ValueError("calibration needs held-out samples")
+    thresholds = np.unique(np.quantile(margins, np.linspace(0.0, 1.0, points)))
+    accuracy = np.array([correct[margins >= threshold].mean() for threshold in thresholds])
+    # Larger margins must never look less reliable than smaller ones.
+    accuracy = np.maximum.accumulate(accuracy)
+    return PrefilterModel(model.labels, model.log_probs, thresholds, accuracy)
+
+
+def save_prefilter(model: PrefilterModel, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as handle:
+        np.savez_compressed(
+            handle,
+            labels=np.array(model.labels),
+            log_probs=model.log_probs,
+            thresholds=model.thresholds,
+            accuracy=model.accuracy,
+        )
+
+
+_load_failures: Dict[str, str] = {}
+
+
+def load_prefilter(path: str) -> PrefilterModel:
+    # A missing or broken model is reported once instead of re-read for every chunk.
+    if path in _load_failures:
+        raise ValueError(_load_failures[path])
+    try:
+        return _read_prefilter(path)
+    except (OSError, KeyError, ValueError) as exc:
+        _load_failures[path] = str(exc)
+        raise
+
+
+@lru_cache(maxsize=1)
+def _read_prefilter(path: str) -> PrefilterModel:
+    with np.load(path) as data:
+        return PrefilterModel(
+            labels=tuple(str(label) for label in data["labels"]),
+            log_probs=data["log_probs"],
+            thresholds=data["thresholds"],
+            accuracy=data["accuracy"],
+        )
+
+
+def _marker_vote(text: str) -> Optional[Tuple[str, float]]:
+    hits = Counter(
+        label for word in _latin_words(text) for label, words in MARKERS.items() if word in words
+    )
+    if not hits:
+        return None
+    label, count = hits.most_common(1)[0]
+    if count < MIN_MARKER_HITS:
+        return None
+    return label, count / sum(hits.values())
+
+
+def prefilter_language(text: str, model: Optional[PrefilterModel]) -> Optional[Tuple[str, float]]:
+    letters = sum(len(word) for word in WORD_RE.findall(text))
+    cyrillic = len(CYRILLIC_RE.findall(text))
+    if letters and cyrillic / letters >= MIN_CYRILLIC_SHARE:
+        # Bosnian and Croatian are written in Latin script, but other Cyrillic languages are
+        # only ruled out by their letters; anything less clear-cut is left to fastText.
+        chars = set(text.lower())
+        if chars & SERBIAN_CYRILLIC and not chars & NON_SERBIAN_CYRILLIC:
+            return "sr", min(cyrillic / letters, 1.0)
+        return None
+    if model is not None:
+        return model.predict(text)
+    return _marker_vote(text)
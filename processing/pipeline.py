@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from processing.cleaning import clean_document, passes_quality_checks
+from processing.language_check import preload_language_model, validate_languages
+from processing.normalization import normalize_document
+from utils.text_utils import TextStats, text_stats_batch
+
+
+CHUNK_SIZE = 256
+
+_worker_config: Dict = {}
+_worker_logger = logging.getLogger("balkan_nlp")
+
+
+def _prepare_document(
+    document: Dict, text: str, stats: TextStats, config: Dict
+) -> Optional[str]:
+    cleaning_config = config.get("cleaning", {})
+    if not passes_quality_checks(text, cleaning_config, config.get("quality", {}), stats=stats):
+        return "quality"
+    document["text"] = text
+    if not document.get("language"):
+        return "missing_language"
+    return None
+
+
+def process_chunk(chunk: List[Dict], config: Dict, logger) -> List[Tuple[Dict, Optional[str]]]:
+    cleaning_config = config.get("cleaning", {})
+    texts = [
+        normalize_document(clean_document(doc["text"], cleaning_config), cleaning_config)
+        for doc in chunk
+    ]
+    # Short documents share one vectorised pass; long ones are counted on their own.
+    stats = text_stats_batch(texts)
+    reasons = [
+        _prepare_document(doc, text, doc_stats, config)
+        for doc, text, doc_stats in zip(chunk, texts, stats)
+    ]
+    pending = [index for index, reason in enumerate(reasons) if reason is None]
+    checks = validate_languages(
+        [chunk[index] for index in pending], config.get("language_assignment", {}), logger
+    )
+    for index, check in zip(pending, checks):
+        if not check.passed:
+            reasons[index] = "language"
+            logger.debug(
+                "Language mismatch for %s: expected %s, %s predicted %s (%.2f)",
+                chunk[index].get("url") or chunk[index].get("id"),
+                chunk[index].get("language"),
+                check.method,
+                check.predicted,
+                check.confidence,
+            )
+    return list(zip(chunk, reasons))
+
+
+def process_document(document: Dict, config: Dict, logger) -> Optional[str]:
+    return process_chunk([document], config, logger)[0][1]
+
+
+def _init_worker(config: Dict, log_level: int) -> None:
+    global _worker_config
+    _worker_config = config
+    _worker_logger.setLevel(log_level)
+    preload_language_model(config.get("language_assignment", {}), _worker_logger)
+
+
+def _process_chunk(chunk: List[Dict]) -> List[Tuple[Dict, Optional[str]]]:
+    return process_chunk(chunk, _worker_config, _worker_logger)
+
+
+def _chunks(documents: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    iterator = iter(documents)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def process_documents(
+    documents: Iterable[Dict],
+    config: Dict,
+    logger,
+    workers: int = 1,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[Tuple[Dict, Optional[str]]]:
+    if workers <= 1:
+        for chunk in _chunks(documents, chunk_size):
+            yield from process_chunk(chunk, config, logger)
+        return
+
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(config, logger.getEffectiveLevel()),
+    )
+    pending: Deque[Future] = deque()
+    try:
+        for chunk in _chunks(documents, chunk_size):
+            pending.append(executor.submit(_process_chunk, chunk))
+            if len(pending) >= workers * 4:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import random
 from collections import defaultdict
 from typing import Dict, Iterable, List
@@ -29,3 +30,20 @@ def split_dataset(data: Iterable[Dict], config: Dict) -> Dict[str, List[Dict]]:
         splits["test"].extend(items[train_count + val_count :])
 
     return splits
+
+
+def split_for(item: Dict, config: Dict) -> str:
+    # Streaming splits hash each document, so ratios are approximate within small strata.
+    stratum = "|".join(str(item.get(field, "")) for field in config.get("stratify_by", []))
+    key = item.get("url") or item.get("text", "")
+    seed = config.get("random_seed", 42)
+    digest = hashlib.sha256(f"{seed}:{stratum}:{key}".encode("utf-8")).digest()
+    position = int.from_bytes(digest[:8], "big") / 2**64
+
+    train_ratio = config.get("train", 0.8)
+    val_ratio = config.get("validation", 0.1)
+    if position < train_ratio:
+        return "train"
+    if position < train_ratio + val_ratio:
+        return "validation"
+    return "test"
@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+import gzip
+import json
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from hashlib import sha256
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+DEFAULT_TTLS: Dict[str, Optional[float]] = {
+    "robots": 86400.0,
+    "sitemap": 86400.0,
+    "feed": 3600.0,
+    "article": None,
+}
+SITEMAP_NAME_RE = re.compile(r"[\w.-]*sitemap[\w.-]*\.xml(?:\.gz)?")
+FEED_SEGMENTS = frozenset({"rss", "feed", "feeds", "atom", "rss.xml", "feed.xml", "atom.xml"})
+
+
+def classify_url(url: str) -> str:
+    path = urlparse(url).path.lower()
+    # Whole segments and suffixes only: "/vijesti/atomska-elektrana" is an article.
+    segments = [segment for segment in path.split("/") if segment]
+    name = segments[-1] if segments else ""
+    if name == "robots.txt":
+        return "robots"
+    if SITEMAP_NAME_RE.fullmatch(name):
+        return "sitemap"
+    if FEED_SEGMENTS.intersection(segments) or name.endswith((".rss", ".atom")):
+        return "feed"
+    return "article"
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    content: bytes
+    encoding: Optional[str] = None
+    status: int = 200
+    headers: Dict[str, str] = field(default_factory=dict)
+    fetched_at: float = field(default_factory=time.time)
+    expires_at: Optional[float] = None
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        if self.expires_at is None:
+            return True
+        return (now if now is not None else time.time()) < self.expires_at
+
+
+@dataclass
+class CacheStats:
+    entries: int
+    expired: int
+    raw_bytes: int
+    stored_bytes: int
+    file_bytes: int
+    by_class: Dict[str, int] = field(default_factory=dict)
+
+
+class FetchCache(ABC):
+    def __init__(self, ttls: Optional[Dict[str, Optional[float]]] = None) -> None:
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+
+    def expires_at(self, url: str, fetched_at: float) -> Optional[float]:
+        ttl = self.ttls.get(classify_url(url))
+        if ttl is None:
+            return None
+        return fetched_at + float(ttl)
+
+    @abstractmethod
+    def get(self, url: str) -> Optional[CacheEntry]: ...
+
+    @abstractmethod
+    def put(self, entry: CacheEntry) -> None: ...
+
+    @abstractmethod
+    def stats(self) -> CacheStats: ...
+
+    def compact(self) -> CacheStats:
+        return self.stats()
+
+    def close(self) -> None:
+        return None
+
+
+class FileCache(FetchCache):
+    def __init__(self, cache_dir: Path, ttls: Optional[Dict[str, Optional[float]]] = None) -> None:
+        super().__init__(ttls)
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, url: str) -> Path:
+        digest = sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest}.gz"
+
+    def _meta_path(self, url: str) -> Path:
+        return self._path(url).with_suffix(".json")
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        path = self._path(url)
+        if not path.exists():
+            return None
+        with gzip.open(path, "rb") as handle:
+            content = handle.read()
+        meta_path = self._meta_path(url)
+        if not meta_path.exists():
+            # Bodies written before the metadata sidecar existed were UTF-8 text.
+            fetched_at = path.stat().st_mtime
+            return CacheEntry(
+                url=url,
+                content=content,
+                encoding="utf-8",
+                fetched_at=fetched_at,
+                expires_at=self.expires_at(url, fetched_at),
+            )
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        return CacheEntry(
+            url=url,
+            content=content,
+            encoding=meta.get("encoding"),
+            status=meta.get("status", 200),
+            headers=meta.get("headers", {}),
+            fetched_at=meta["fetched_at"],
+            expires_at=meta.get("expires_at"),
+        )
+
+    def put(self, entry: CacheEntry) -> None:
+        if entry.expires_at is None:
+            entry.expires_at = self.expires_at(entry.url, entry.fetched_at)
+        meta = {
+            "url": entry.url,
+            "encoding": entry.encoding,
+            "status": entry.status,
+            "headers": entry.headers,
+            "fetched_at": entry.fetched_at,
+            "expires_at": entry.expires_at,
+            "raw_size": len(entry.content),
+        }
+        # The sidecar goes first: a body without one would be misread as legacy UTF-8 text.
+        self._meta_path(entry.url).write_text(json.dumps(meta), encoding="utf-8")
+        with gzip.open(self._path(entry.url), "wb") as handle:
+            handle.write(entry.content)
+
+    def stats(self) -> CacheStats:
+        files = list(self.cache_dir.glob("*.gz"))
+        stored = sum(path.stat().st_size for path in files)
+        raw_bytes = 0
+        expired = 0
+        by_class: Dict[str, int] = {}
+        now = time.time()
+        for path in files:
+            meta_path = path.with_suffix(".json")
+            if not meta_path.exists():
+                continue
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            raw_bytes += meta.get("raw_size", 0)
+            if meta.get("expires_at") is not None and meta["expires_at"] < now:
+                expired += 1
+            url_class = classify_url(meta.get("url", ""))
+            by_class[url_class] = by_class.get(url_class, 0) + 1
+        sidecars = sum(path.stat().st_size for path in self.cache_dir.glob("*.json"))
+        return CacheStats(
+            entries=len(files),
+            expired=expired,
+            raw_bytes=raw_bytes,
+            stored_bytes=stored,
+            file_bytes=stored + sidecars,
+            by_class=by_class,
+        )
+
+
+class SQLiteCache(FetchCache):
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: Optional[int] = None,
+        ttls: Optional[Dict[str, Optional[float]]] = None,
+    ) -> None:
+        super().__init__(ttls)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                url_class TEXT NOT NULL,
+                body BLOB NOT NULL,
+                raw_size INTEGER NOT NULL,
+                stored_size INTEGER NOT NULL,
+                encoding TEXT,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                expires_at REAL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)"
+        )
+        row = self._conn.execute("SELECT COALESCE(SUM(stored_size), 0) FROM responses").fetchone()
+        self._stored_bytes = int(row[0])
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, encoding, status, headers, fetched_at, expires_at "
+                "FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url)
+            )
+        body, encoding, status, headers, fetched_at, expires_at = row
+        try:
+            content = zlib.decompress(body)
+        except zlib.error:
+            return None
+        return CacheEntry(
+            url=url,
+            content=content,
+            encoding=encoding,
+            status=status,
+            headers=json.loads(headers),
+            fetched_at=fetched_at,
+            expires_at=expires_at,
+        )
+
+    def put(self, entry: CacheEntry) -> None:
+        if entry.expires_at is None:
+            entry.expires_at = self.expires_at(entry.url, entry.fetched_at)
+        body = zlib.compress(entry.content, 6)
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT stored_size FROM responses WHERE url = ?", (entry.url,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    entry.url,
+                    classify_url(entry.url),
+                    body,
+                    len(entry.content),
+                    len(body),
+                    entry.encoding,
+                    entry.status,
+                    json.dumps(entry.headers),
+                    entry.fetched_at,
+                    entry.expires_at,
+                    time.time(),
+                ),
+            )
+            self._stored_bytes += len(body) - (previous[0] if previous else 0)
+            if self.max_bytes is not None and self._stored_bytes > self.max_bytes:
+                self._evict(int(self.max_bytes * 0.9))
+
+    def _evict(self, target_bytes: int) -> None:
+        while self._stored_bytes > target_bytes:
+            rows = self._conn.execute(
+                "SELECT url, stored_size FROM responses ORDER BY accessed_at LIMIT 500"
+            ).fetchall()
+            if not rows:
+                self._stored_bytes = 0
+                return
+            victims = []
+            for url, size in rows:
+                victims.append((url,))
+                self._stored_bytes -= size
+                if self._stored_bytes <= target_bytes:
+                    break
+            self._conn.executemany("DELETE FROM responses WHERE url = ?", victims)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            entries, raw_bytes, stored_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(stored_size), 0) "
+                "FROM responses"
+            ).fetchone()
+            expired = self._conn.execute(
+                "SELECT COUNT(*) FROM responses WHERE expires_at IS NOT NULL AND expires_at < ?",
+                (time.time(),),
+            ).fetchone()[0]
+            by_class = dict(
+                self._conn.execute(
+                    "SELECT url_class, COUNT(*) FROM responses GROUP BY url_class"
+                ).fetchall()
+            )
+        file_bytes = sum(
+            candidate.stat().st_size
+            for candidate in self.path.parent.glob(f"{self.path.name}*")
+            if candidate.is_file()
+        )
+        return CacheStats(
+            entries=entries,
+            expired=expired,
+            raw_bytes=raw_bytes,
+            stored_bytes=stored_bytes,
+            file_bytes=file_bytes,
+            by_class=by_class,
+        )
+
+    def compact(self) -> CacheStats:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at < ?",
+                (time.time(),),
+            )
+            row = self._conn.execute("SELECT COALESCE(SUM(stored_size), 0) FROM responses").fetchone()
+            self._stored_bytes = int(row[0])
+            if self.max_bytes is not None and self._stored_bytes > self.max_bytes:
+                self._evict(int(self.max_bytes * 0.9))
+            self._conn.execute("VACUUM")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return self.stats()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,39 +1,264 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any, Dict, Optional
+import copy
+import json
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
-from bs4 import BeautifulSoup
-import trafilatura
-from trafilatura.metadata import extract_metadata
+from lxml import etree
+from trafilatura import bare_extraction, load_html
+from trafilatura.settings import Document
 
+try:
+    from cssselect import GenericTranslator
+except ImportError:  # pragma: no cover - optional dependency
+    _css_translator: Optional[GenericTranslator] = None
+else:
+    _css_translator = GenericTranslator()
 
-def extract_article(html: str, url: str) -> Optional[Dict[str, Any]]:
+if TYPE_CHECKING:
+    from scraping.extract_cache import ExtractionCache
+
+
+EXTRACTOR_VERSION = "2"
+EXTRACTION_OPTIONS: Dict[str, Any] = {
+    "include_comments": False,
+    "include_tables": False,
+    "include_images": False,
+    "include_links": False,
+}
+FALLBACK_TEXT_XPATH = etree.XPath(
+    "//body//text()[not(ancestor::script or ancestor::style or ancestor::noscript)]"
+)
+TITLE_XPATH = etree.XPath("//title")
+
+
+BLOCK_TAGS = (
+    "p", "div", "section", "article", "blockquote", "li", "tr", "br",
+    "h1", "h2", "h3", "h4", "h5", "h6",
+)
+
+
+@dataclass(frozen=True)
+class SourceSelectors:
+    body: etree.XPath
+    title: Optional[etree.XPath]
+    date: Optional[etree.XPath]
+    drop: Tuple[etree.XPath, ...]
+    min_chars: int
+
+
+def _compile_expression(expression: str) -> etree.XPath:
+    if expression.startswith("css:"):
+        if _css_translator is None:
+            raise RuntimeError("cssselect is required for css: selectors")
+        expression = _css_translator.css_to_xpath(expression[4:].strip())
+    return etree.XPath(expression)
+
+
+@lru_cache(maxsize=256)
+def _compile_selectors(spec_key: str) -> SourceSelectors:
+    spec = json.loads(spec_key)
+    if not spec.get("body"):
+        raise ValueError("extract selectors require a body expression")
+    return SourceSelectors(
+        body=_compile_expression(spec["body"]),
+        title=_compile_expression(spec["title"]) if spec.get("title") else None,
+        date=_compile_expression(spec["date"]) if spec.get("date") else None,
+        drop=tuple(_compile_expression(expression) for expression in spec.get("drop") or []),
+        min_chars=int(spec.get("min_chars", 200)),
+    )
+
+
+def selectors_key(selectors: Optional[Dict[str, Any]]) -> str:
+    if not selectors:
+        return ""
+    return json.dumps(selectors, sort_keys=True, ensure_ascii=False)
+
+
+def compile_selectors(selectors: Dict[str, Any]) -> SourceSelectors:
+    return _compile_selectors(selectors_key(selectors))
+
+
+def _first_value(xpath: Optional[etree.XPath], tree) -> Optional[str]:
+    if xpath is None:
+        return None
+    result = xpath(tree)
+    values = result if isinstance(result, list) else [result]
+    for value in values:
+        text = value.text_content() if hasattr(value, "text_content") else str(value)
+        text = " ".join(text.split())
+        if text:
+            return text
+    return None
+
+
+def _block_text(node) -> str:
+    etree.strip_elements(node, "script", "style", "noscript", with_tail=False)
+    for element in node.iter(*BLOCK_TAGS):
+        element.tail = "\n" + (element.tail or "")
+    lines = (" ".join(line.split()) for line in node.text_content().splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _selector_article(tree, url: str, selectors: SourceSelectors) -> Optional[Dict[str, Any]]:
+    bodies = [node for node in selectors.body(tree) if hasattr(node, "text_content")]
+    if not bodies:
+        return None
+    parts: List[str] = []
+    for body in bodies:
+        body = copy.deepcopy(body)
+        for xpath in selectors.drop:
+            for element in xpath(body):
+                if hasattr(element, "drop_tree"):
+                    element.drop_tree()
+        text = _block_text(body)
+        if text:
+            parts.append(text)
+    text = "\n".join(parts)
+    if len(text) < selectors.min_chars:
+        return None
+    title = _first_value(selectors.title, tree) or _first_value(TITLE_XPATH, tree)
+    return {"text": text, "title": title, "date": _first_value(selectors.date, tree), "url": url}
+
+
+def _fallback_article(tree, url: str) -> Dict[str, Any]:
+    text = " ".join(chunk.strip() for chunk in FALLBACK_TEXT_XPATH(tree) if chunk.strip())
+    title = tree.findtext(".//title")
+    return {"text": text, "title": title.strip() if title else None, "date": None, "url": url}
+
+
+def extract_article(
+    html: str, url: str, selectors: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
     if not html:
         return None
 
-    extracted = trafilatura.extract(
-        html,
-        include_comments=False,
-        include_tables=False,
-        include_images=False,
-        include_links=False,
-    )
+    tree = load_html(html)
+    if tree is None:
+        return None
 
-    if extracted is None:
-        soup = BeautifulSoup(html, "html.parser")
-        text = soup.get_text(" ", strip=True)
-        title = soup.title.string.strip() if soup.title and soup.title.string else None
-        return {"text": text, "title": title, "date": None, "url": url}
+    if selectors:
+        extracted = _selector_article(tree, url, compile_selectors(selectors))
+        if extracted is not None:
+            return extracted
 
-    metadata = extract_metadata(html)
-    date_value: Optional[datetime] = None
-    if metadata and metadata.date:
-        date_value = metadata.date
+    document = bare_extraction(tree, url=url, with_metadata=True, **EXTRACTION_OPTIONS)
+    # Without as_dict, bare_extraction returns a Document or None.
+    if not isinstance(document, Document) or not document.text:
+        return _fallback_article(tree, url)
 
     return {
-        "text": extracted,
-        "title": metadata.title if metadata else None,
-        "date": date_value,
+        "text": document.text,
+        "title": document.title,
+        "date": document.date,
         "url": url,
     }
+
+
+def _safe_extract(
+    html: str, url: str, selectors: Optional[Dict[str, Any]] = None
+) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+    try:
+        return url, extract_article(html, url, selectors), None
+    except Exception as exc:
+        return url, None, str(exc)
+
+
+def _cached_result(
+    url: str, extracted: Optional[Dict[str, Any]]
+) -> Tuple[str, Optional[Dict[str, Any]]]:
+    if extracted is None:
+        return url, None
+    return url, {**extracted, "url": url}
+
+
+def extract_many(
+    pages: Iterable[Tuple[str, Optional[str]]],
+    logger,
+    max_workers: Optional[int] = None,
+    max_pending: Optional[int] = None,
+    cache: Optional[ExtractionCache] = None,
+    selectors_for: Optional[Callable[[str], Optional[Dict[str, Any]]]] = None,
+) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+    workers = max_workers or os.cpu_count() or 1
+
+    def _finish(
+        result: Tuple[str, Optional[Dict[str, Any]], Optional[str]], key: Optional[str]
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        url, extracted, error = result
+        if error:
+            logger.warning("Extraction failed for %s: %s", url, error)
+        elif cache is not None and key is not None:
+            cache.put(key, extracted)
+        return url, extracted
+
+    def _selectors(url: str) -> Optional[Dict[str, Any]]:
+        return selectors_for(url) if selectors_for is not None else None
+
+    def _lookup(
+        html: str, selectors: Optional[Dict[str, Any]]
+    ) -> Tuple[Optional[str], bool, Optional[Dict[str, Any]]]:
+        if cache is None:
+            return None, False, None
+        key = cache.key(html, selectors_key(selectors))
+        found, extracted = cache.get(key)
+        return key, found, extracted
+
+    if workers <= 1:
+        for url, html in pages:
+            if not html:
+                continue
+            selectors = _selectors(url)
+            key, found, extracted = _lookup(html, selectors)
+            if found:
+                yield _cached_result(url, extracted)
+                continue
+            yield _finish(_safe_extract(html, url, selectors), key)
+        return
+
+    limit = max_pending or workers * 4
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        pending: Dict[Future, Optional[str]] = {}
+
+        def _collect(done: Set[Future]) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+            for future in done:
+                yield _finish(future.result(), pending.pop(future))
+
+        try:
+            for url, html in pages:
+                if not html:
+                    continue
+                selectors = _selectors(url)
+                key, found, extracted = _lookup(html, selectors)
+                if found:
+                    yield _cached_result(url, extracted)
+                    continue
+                pending[executor.submit(_safe_extract, html, url, selectors)] = key
+                if len(pending) >= limit:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                else:
+                    done = {future for future in pending if future.done()}
+                yield from _collect(done)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from _collect(done)
+        finally:
+            for future in pending:
+                future.cancel()
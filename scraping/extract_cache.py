@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+import zlib
+from hashlib import sha256
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from scraping.extract import EXTRACTION_OPTIONS, EXTRACTOR_VERSION
+
+
+def _package_version(name: str) -> str:
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def extractor_fingerprint() -> str:
+    settings = {
+        "extractor": EXTRACTOR_VERSION,
+        "trafilatura": _package_version("trafilatura"),
+        "lxml": _package_version("lxml"),
+        "options": EXTRACTION_OPTIONS,
+    }
+    return sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class ExtractionCache:
+    def __init__(self, path: Path, fingerprint: Optional[str] = None) -> None:
+        self.path = path
+        self.fingerprint = fingerprint or extractor_fingerprint()
+        self.hits = 0
+        self.misses = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS extractions (
+                key TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM extractions WHERE fingerprint != ?", (self.fingerprint,)
+            )
+
+    def key(self, html: str, variant: str = "") -> str:
+        digest = sha256(html.encode("utf-8", errors="surrogatepass"))
+        digest.update(variant.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        row = self._conn.execute(
+            "SELECT payload FROM extractions WHERE key = ? AND fingerprint = ?",
+            (key, self.fingerprint),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, json.loads(zlib.decompress(row[0]))
+
+    def put(self, key: str, extracted: Optional[Dict[str, Any]]) -> None:
+        payload = None
+        if extracted is not None:
+            payload = {
+                "text": extracted.get("text"),
+                "title": extracted.get("title"),
+                "date": extracted.get("date"),
+            }
+        body = zlib.compress(json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"))
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO extractions VALUES (?, ?, ?, ?)",
+                (key, self.fingerprint, body, time.time()),
+            )
+
+    def close(self) -> None:
+        self._conn.close()
@@ -1,16 +1,34 @@
 from __future__ import annotations
 
-import gzip
 import importlib
+import queue
+import threading
 import time
+from contextlib import nullcontext
 from dataclasses import dataclass
-from hashlib import sha256
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    TypeAlias,
+    Union,
+    overload,
+)
 from urllib.parse import urljoin, urlparse
 from urllib.robotparser import RobotFileParser
 
 import requests
+from requests.structures import CaseInsensitiveDict
+
+from scraping.cache import CacheEntry, FetchCache, FileCache, SQLiteCache
+from scraping.warc import WarcWriter
 
 
 @dataclass
@@ -21,21 +39,176 @@ class FetchConfig:
     respect_robots_txt: bool
     cache_enabled: bool
     cache_dir: Path
+    max_workers: int = 8
+    burst: int = 1
+    rate_limit: float = 1.0
+    max_retry_after: float = 300.0
+    cache_backend: str = "sqlite"
+    cache_max_bytes: Optional[int] = None
+    cache_ttl: Optional[Dict[str, Optional[float]]] = None
+    warc_dir: Optional[Path] = None
+    warc_max_bytes: int = 1024**3
+
+
+@dataclass
+class FetchRequest:
+    url: str
+    rate_limit: Optional[float] = None
+    use_cloudscraper: bool = False
+    burst: Optional[int] = None
+
+
+DomainQueue: TypeAlias = "queue.Queue[Optional[Tuple[FetchRequest, Optional[CacheEntry]]]]"
+
+
+@dataclass
+class FetchStats:
+    cache_hits: int = 0
+    cache_misses: int = 0
+    revalidated: int = 0
+    throttled: int = 0
+    robots_blocked: int = 0
+    failures: int = 0
 
 
 class RateLimiter:
-    def __init__(self, requests_per_second: float = 1.0) -> None:
-        self.min_interval = 1.0 / requests_per_second
-        self.last_request: Optional[float] = None
+    def __init__(self, requests_per_second: float = 1.0, burst: int = 1) -> None:
+        self.target_rate = requests_per_second
+        self.rate = requests_per_second
+        self.min_rate = requests_per_second / 16
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def min_interval(self) -> float:
+        return 1.0 / self.rate
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(float(self.burst), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
 
     def wait(self) -> None:
-        if self.last_request is None:
-            self.last_request = time.time()
-            return
-        elapsed = time.time() - self.last_request
-        if elapsed < self.min_interval:
-            time.sleep(self.min_interval - elapsed)
-        self.last_request = time.time()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.blocked_until and self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                delay = max(self.blocked_until - now, (1.0 - self.tokens) / self.rate)
+            time.sleep(delay)
+
+    def penalize(self, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def configure(self, requests_per_second: Optional[float], burst: Optional[int]) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            if requests_per_second is not None and requests_per_second != self.target_rate:
+                # A domain still backing off from throttling keeps its reduced rate.
+                if self.rate >= self.target_rate:
+                    self.rate = requests_per_second
+                self.rate = min(self.rate, requests_per_second)
+                self.target_rate = requests_per_second
+                self.min_rate = requests_per_second / 16
+            if burst is not None:
+                self.burst = max(1, burst)
+                self.tokens = min(self.tokens, float(self.burst))
+
+    def reward(self) -> None:
+        with self._lock:
+            if self.rate < self.target_rate:
+                self._refill(time.monotonic())
+                self.rate = min(self.target_rate, self.rate + self.target_rate / 10)
+
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _parse_robots(parser: RobotFileParser, entry: CacheEntry) -> None:
+    if entry.status in (401, 403):
+        parser.parse(["User-agent: *", "Disallow: /"])
+    elif 400 <= entry.status < 500:
+        parser.parse([])
+    else:
+        parser.parse(entry.text.splitlines())
+
+
+def _conditional_headers(entry: Optional[CacheEntry]) -> Optional[Dict[str, str]]:
+    if entry is None:
+        return None
+    stored = CaseInsensitiveDict(entry.headers)
+    headers: Dict[str, str] = {}
+    if stored.get("ETag"):
+        headers["If-None-Match"] = stored["ETag"]
+    if stored.get("Last-Modified"):
+        headers["If-Modified-Since"] = stored["Last-Modified"]
+    return headers or None
+
+
+def _cache_entry(url: str, response: requests.Response) -> CacheEntry:
+    return CacheEntry(
+        url=url,
+        content=response.content,
+        encoding=response.encoding or response.apparent_encoding,
+        status=response.status_code,
+        headers=dict(response.headers),
+    )
+
+
+def build_fetch_config(collection: Dict) -> FetchConfig:
+    max_mb = collection.get("cache_max_mb")
+    warc_dir = collection.get("warc_dir")
+    return FetchConfig(
+        user_agent=collection.get("user_agent", "BalkanNLP/1.0"),
+        timeout=collection.get("timeout", 30),
+        max_retries=collection.get("max_retries", 3),
+        respect_robots_txt=collection.get("respect_robots_txt", True),
+        cache_enabled=collection.get("cache_enabled", True),
+        cache_dir=Path(collection.get("cache_dir", "./cache")),
+        max_workers=collection.get("max_workers", 8),
+        burst=collection.get("default_burst", 1),
+        rate_limit=collection.get("default_rate_limit", 1.0),
+        max_retry_after=collection.get("max_retry_after", 300),
+        cache_backend=collection.get("cache_backend", "sqlite"),
+        cache_max_bytes=int(max_mb * 1024 * 1024) if max_mb else None,
+        cache_ttl=collection.get("cache_ttl"),
+        warc_dir=Path(warc_dir) if warc_dir else None,
+        warc_max_bytes=int(collection.get("warc_max_mb", 1024) * 1024 * 1024),
+    )
+
+
+def open_cache(config: FetchConfig) -> FetchCache:
+    if config.cache_backend == "files":
+        return FileCache(config.cache_dir, ttls=config.cache_ttl)
+    if config.cache_backend == "sqlite":
+        return SQLiteCache(
+            config.cache_dir / "fetch_cache.sqlite3",
+            max_bytes=config.cache_max_bytes,
+            ttls=config.cache_ttl,
+        )
+    raise ValueError(f"Unknown cache backend: {config.cache_backend}")
 
 
 class Fetcher:
@@ -48,27 +221,159 @@ class Fetcher:
         self._warned_cloudscraper = False
         self._robots: Dict[str, RobotFileParser] = {}
         self._limiters: Dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+        self._robots_locks: Dict[str, threading.Lock] = {}
         self.config.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.cache: Optional[FetchCache] = open_cache(config) if config.cache_enabled else None
+        self.stats = FetchStats()
+        self.warc: Optional[WarcWriter] = None
+        if config.warc_dir is not None:
+            self.warc = WarcWriter(config.warc_dir, max_bytes=config.warc_max_bytes)
 
-    def _cache_path(self, url: str) -> Path:
-        digest = sha256(url.encode("utf-8")).hexdigest()
-        return self.config.cache_dir / f"{digest}.gz"
+    def close(self) -> None:
+        if self.warc is not None:
+            self.warc.close()
+        if self.cache is not None:
+            self.cache.close()
 
-    def _get_robot_parser(self, base_url: str) -> RobotFileParser:
-        if base_url not in self._robots:
-            parser = RobotFileParser()
-            parser.set_url(urljoin(base_url, "/robots.txt"))
-            try:
-                parser.read()
-            except Exception as exc:
-                self.logger.warning("Failed to read robots.txt for %s: %s", base_url, exc)
-            self._robots[base_url] = parser
-        return self._robots[base_url]
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self.stats, name, getattr(self.stats, name) + 1)
+
+    def log_stats(self) -> None:
+        stats = self.stats
+        lookups = stats.cache_hits + stats.cache_misses
+        hit_rate = 100.0 * stats.cache_hits / lookups if lookups else 0.0
+        self.logger.info(
+            "Fetch stats: %s cache hits, %s misses (%.1f%% hit rate), %s revalidated, "
+            "%s throttled, %s blocked by robots.txt, %s failed",
+            stats.cache_hits,
+            stats.cache_misses,
+            hit_rate,
+            stats.revalidated,
+            stats.throttled,
+            stats.robots_blocked,
+            stats.failures,
+        )
+
+    def _lookup_cache(self, url: str) -> Optional[CacheEntry]:
+        if self.cache is None:
+            return None
+        try:
+            return self.cache.get(url)
+        except Exception as exc:
+            self.logger.warning("Failed to read cache for %s: %s", url, exc)
+            return None
+
+    def _fresh_entry(self, entry: Optional[CacheEntry]) -> Optional[CacheEntry]:
+        if entry is None or not entry.is_fresh():
+            return None
+        self._count("cache_hits")
+        return entry
+
+    def cached(self, url: str) -> Optional[str]:
+        entry = self._fresh_entry(self._lookup_cache(url))
+        return entry.text if entry is not None else None
+
+    def _store(self, entry: CacheEntry) -> None:
+        if self.cache is None:
+            return
+        try:
+            self.cache.put(entry)
+        except Exception as exc:
+            self.logger.warning("Failed to write cache for %s: %s", entry.url, exc)
 
-    def _get_rate_limiter(self, domain: str, rate_limit: float) -> RateLimiter:
-        if domain not in self._limiters:
-            self._limiters[domain] = RateLimiter(rate_limit)
-        return self._limiters[domain]
+    def _get_robot_parser(self, base_url: str, use_cloudscraper: bool = False) -> RobotFileParser:
+        with self._lock:
+            domain_lock = self._robots_locks.setdefault(base_url, threading.Lock())
+        with domain_lock:
+            parser = self._robots.get(base_url)
+            if parser is None:
+                parser, final = self._load_robots(base_url, use_cloudscraper)
+                # Unreachable robots.txt is asked for again on the next request.
+                if final:
+                    self._robots[base_url] = parser
+        return parser
+
+    def _load_robots(
+        self, base_url: str, use_cloudscraper: bool
+    ) -> Tuple[RobotFileParser, bool]:
+        robots_url = urljoin(base_url, "/robots.txt")
+        parser = RobotFileParser(robots_url)
+        entry = self._lookup_cache(robots_url)
+        if entry is None or not entry.is_fresh():
+            # Never wait out a Retry-After here: the caller holds this domain's robots lock.
+            response = self._request(
+                self._select_session(use_cloudscraper),
+                robots_url,
+                _conditional_headers(entry),
+                retry_throttled=False,
+            )
+            if response is None:
+                if entry is None:
+                    self.logger.warning("Failed to read robots.txt for %s; disallowing", base_url)
+                    parser.parse(["User-agent: *", "Disallow: /"])
+                    return parser, False
+                self.logger.warning("Failed to read robots.txt for %s; using stale copy", base_url)
+                _parse_robots(parser, entry)
+                return parser, False
+            if response.status_code == 429 or response.status_code >= 500:
+                # RFC 9309: an unreachable robots.txt means complete disallow.
+                self.logger.warning(
+                    "robots.txt for %s unavailable (HTTP %s); disallowing for now",
+                    base_url,
+                    response.status_code,
+                )
+                parser.parse(["User-agent: *", "Disallow: /"])
+                return parser, False
+            if response.status_code == 304 and entry is not None:
+                entry.headers.update(response.headers)
+                entry.fetched_at = time.time()
+                entry.expires_at = None
+            else:
+                entry = _cache_entry(robots_url, response)
+            self._store(entry)
+
+        _parse_robots(parser, entry)
+        return parser, True
+
+    def _crawl_delay(self, url: str) -> Optional[float]:
+        if not self.config.respect_robots_txt:
+            return None
+        parsed = urlparse(url)
+        parser = self._robots.get(f"{parsed.scheme}://{parsed.netloc}")
+        if parser is None:
+            return None
+        delay = parser.crawl_delay(self.config.user_agent)
+        if delay:
+            return float(delay)
+        rate = parser.request_rate(self.config.user_agent)
+        if rate and rate.requests:
+            return rate.seconds / rate.requests
+        return None
+
+    def _get_rate_limiter(
+        self,
+        domain: str,
+        rate_limit: Optional[float],
+        crawl_delay: Optional[float] = None,
+        burst: Optional[int] = None,
+    ) -> RateLimiter:
+        if crawl_delay:
+            rate_limit = min(rate_limit or self.config.rate_limit, 1.0 / crawl_delay)
+            burst = 1
+        with self._lock:
+            limiter = self._limiters.get(domain)
+            if limiter is None:
+                limiter = RateLimiter(
+                    rate_limit or self.config.rate_limit, burst or self.config.burst
+                )
+                self._limiters[domain] = limiter
+                return limiter
+        # Whoever reaches a domain first (often sitemap discovery) must not pin its limits.
+        if rate_limit is not None or burst is not None:
+            limiter.configure(rate_limit, burst)
+        return limiter
 
     def _create_cloudscraper_session(self) -> Optional[requests.Session]:
         try:
@@ -79,53 +384,274 @@ class Fetcher:
         session.headers.update({"User-Agent": self.config.user_agent})
         return session
 
-    def _allowed_by_robots(self, url: str) -> bool:
+    def _select_session(self, use_cloudscraper: bool) -> requests.Session:
+        if not use_cloudscraper:
+            return self.session
+        if self._cloudscraper_session is None:
+            if not self._warned_cloudscraper:
+                self.logger.warning("cloudscraper not available; using requests")
+                self._warned_cloudscraper = True
+            return self.session
+        return self._cloudscraper_session
+
+    def _allowed_by_robots(self, url: str, use_cloudscraper: bool = False) -> bool:
         if not self.config.respect_robots_txt:
             return True
         parsed = urlparse(url)
         base_url = f"{parsed.scheme}://{parsed.netloc}"
-        parser = self._get_robot_parser(base_url)
+        parser = self._get_robot_parser(base_url, use_cloudscraper)
         return parser.can_fetch(self.config.user_agent, url)
 
-    def fetch(self, url: str, rate_limit: float = 1.0, use_cloudscraper: bool = False) -> Optional[str]:
-        if not self._allowed_by_robots(url):
+    def _request(
+        self,
+        session: requests.Session,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        limiter: Optional[RateLimiter] = None,
+        slots: Optional[threading.Semaphore] = None,
+        retry_throttled: bool = True,
+    ) -> Optional[requests.Response]:
+        for attempt in range(1, self.config.max_retries + 1):
+            if limiter is not None:
+                limiter.wait()
+            try:
+                with slots or nullcontext():
+                    response = session.get(url, timeout=self.config.timeout, headers=headers)
+            except requests.RequestException as exc:
+                self.logger.warning("Fetch failed (%s/%s) for %s: %s", attempt, self.config.max_retries, url, exc)
+                time.sleep(min(2**attempt, 10))
+                continue
+
+            if not retry_throttled and (response.status_code == 429 or response.status_code >= 500):
+                if response.status_code in (429, 503):
+                    self._count("throttled")
+                return response
+            if response.status_code in (429, 503):
+                retry_after = _retry_after_seconds(response.headers.get("Retry-After"))
+                if retry_after is not None:
+                    retry_after = min(retry_after, self.config.max_retry_after)
+                self._count("throttled")
+                self.logger.warning(
+                    "Throttled (%s/%s) for %s: HTTP %s, retry after %s",
+                    attempt,
+                    self.config.max_retries,
+                    url,
+                    response.status_code,
+                    retry_after,
+                )
+                if limiter is not None:
+                    limiter.penalize(retry_after)
+                else:
+                    time.sleep(retry_after if retry_after is not None else min(2**attempt, 10))
+                continue
+            if response.status_code >= 500:
+                self.logger.warning(
+                    "Fetch failed (%s/%s) for %s: HTTP %s",
+                    attempt,
+                    self.config.max_retries,
+                    url,
+                    response.status_code,
+                )
+                time.sleep(min(2**attempt, 10))
+                continue
+
+            if limiter is not None:
+                limiter.reward()
+            return response
+        return None
+
+    def fetch(
+        self,
+        url: str,
+        rate_limit: Optional[float] = None,
+        use_cloudscraper: bool = False,
+        burst: Optional[int] = None,
+    ) -> Optional[str]:
+        entry = self._fetch_entry(url, rate_limit, use_cloudscraper, burst)
+        return entry.text if entry is not None else None
+
+    def fetch_bytes(
+        self,
+        url: str,
+        rate_limit: Optional[float] = None,
+        use_cloudscraper: bool = False,
+        burst: Optional[int] = None,
+    ) -> Optional[bytes]:
+        entry = self._fetch_entry(url, rate_limit, use_cloudscraper, burst)
+        return entry.content if entry is not None else None
+
+    def _fetch_entry(
+        self,
+        url: str,
+        rate_limit: Optional[float],
+        use_cloudscraper: bool,
+        burst: Optional[int],
+    ) -> Optional[CacheEntry]:
+        entry = self._lookup_cache(url)
+        cached = self._fresh_entry(entry)
+        if cached is not None:
+            return cached
+        return self._fetch_network(url, rate_limit, use_cloudscraper, entry, burst)
+
+    def _fetch_network(
+        self,
+        url: str,
+        rate_limit: Optional[float],
+        use_cloudscraper: bool,
+        stale: Optional[CacheEntry] = None,
+        burst: Optional[int] = None,
+        slots: Optional[threading.Semaphore] = None,
+    ) -> Optional[CacheEntry]:
+        self._count("cache_misses")
+        if not self._allowed_by_robots(url, use_cloudscraper):
             self.logger.info("Blocked by robots.txt: %s", url)
+            self._count("robots_blocked")
             return None
 
         parsed = urlparse(url)
-        limiter = self._get_rate_limiter(parsed.netloc, rate_limit)
-        limiter.wait()
+        limiter = self._get_rate_limiter(parsed.netloc, rate_limit, self._crawl_delay(url), burst)
+        response = self._request(
+            self._select_session(use_cloudscraper),
+            url,
+            _conditional_headers(stale),
+            limiter,
+            slots,
+        )
+        if response is None:
+            self._count("failures")
+            return None
+        if response.status_code == 304 and stale is not None:
+            self._count("revalidated")
+            stale.headers.update(response.headers)
+            stale.fetched_at = time.time()
+            stale.expires_at = None
+            self._store(stale)
+            return stale
+        if not response.ok:
+            self.logger.warning("Fetch failed for %s: HTTP %s", url, response.status_code)
+            self._count("failures")
+            return None
+
+        entry = _cache_entry(url, response)
+        self._store(entry)
+        if self.warc is not None:
+            try:
+                self.warc.write(entry)
+            except OSError as exc:
+                self.logger.warning("Failed to write WARC record for %s: %s", url, exc)
+        return entry
+
+    @overload
+    def fetch_many(
+        self,
+        urls: Iterable[Union[str, FetchRequest]],
+        rate_limit: Optional[float] = ...,
+        use_cloudscraper: bool = ...,
+        burst: Optional[int] = ...,
+        max_workers: Optional[int] = ...,
+        queue_size: int = ...,
+        binary: Literal[False] = ...,
+    ) -> Iterator[Tuple[str, Optional[str]]]: ...
+
+    @overload
+    def fetch_many(
+        self,
+        urls: Iterable[Union[str, FetchRequest]],
+        rate_limit: Optional[float] = ...,
+        use_cloudscraper: bool = ...,
+        burst: Optional[int] = ...,
+        max_workers: Optional[int] = ...,
+        queue_size: int = ...,
+        *,
+        binary: Literal[True],
+    ) -> Iterator[Tuple[str, Optional[bytes]]]: ...
+
+    def fetch_many(
+        self,
+        urls: Iterable[Union[str, FetchRequest]],
+        rate_limit: Optional[float] = None,
+        use_cloudscraper: bool = False,
+        burst: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        queue_size: int = 0,
+        binary: bool = False,
+    ) -> Iterator[Tuple[str, Optional[Union[str, bytes]]]]:
+        results: "queue.Queue[Tuple[str, Optional[Union[str, bytes]]]]" = queue.Queue(
+            maxsize=queue_size
+        )
+        domains: Dict[str, DomainQueue] = {}
+        threads: List[threading.Thread] = []
+        stop = threading.Event()
+        # One drain thread per domain, so no domain waits behind another's rate limiter;
+        # max_workers only caps the requests that are actually in flight.
+        slots = threading.BoundedSemaphore(max_workers or self.config.max_workers)
+
+        def _payload(entry: Optional[CacheEntry]) -> Optional[Union[str, bytes]]:
+            if entry is None:
+                return None
+            return entry.content if binary else entry.text
 
-        if self.config.cache_enabled:
-            cache_path = self._cache_path(url)
-            if cache_path.exists():
+        def _put(result: Tuple[str, Optional[Union[str, bytes]]]) -> None:
+            while not stop.is_set():
                 try:
-                    with gzip.open(cache_path, "rt", encoding="utf-8") as handle:
-                        return handle.read()
-                except OSError as exc:
-                    self.logger.warning("Failed to read cache for %s: %s", url, exc)
-
-        session = self.session
-        if use_cloudscraper:
-            if self._cloudscraper_session is None:
-                if not self._warned_cloudscraper:
-                    self.logger.warning("cloudscraper not available; using requests")
-                    self._warned_cloudscraper = True
-            else:
-                session = self._cloudscraper_session
+                    results.put(result, timeout=0.5)
+                    return
+                except queue.Full:
+                    continue
 
-        for attempt in range(1, self.config.max_retries + 1):
-            try:
-                response = session.get(url, timeout=self.config.timeout)
-                response.raise_for_status()
-                text = response.text
-                if self.config.cache_enabled:
-                    cache_path = self._cache_path(url)
-                    with gzip.open(cache_path, "wt", encoding="utf-8") as handle:
-                        handle.write(text)
-                return text
-            except requests.RequestException as exc:
-                self.logger.warning("Fetch failed (%s/%s) for %s: %s", attempt, self.config.max_retries, url, exc)
-                time.sleep(min(2**attempt, 10))
+        def _drain(items: DomainQueue) -> None:
+            while not stop.is_set():
+                queued = items.get()
+                if queued is None:
+                    return
+                item, stale = queued
+                try:
+                    fetched = self._fetch_network(
+                        item.url, item.rate_limit, item.use_cloudscraper, stale, item.burst, slots
+                    )
+                except Exception as exc:
+                    self.logger.warning("Fetch crashed for %s: %s", item.url, exc)
+                    fetched = None
+                _put((item.url, _payload(fetched)))
 
-        return None
+        pending = 0
+        try:
+            for item in urls:
+                if isinstance(item, str):
+                    item = FetchRequest(
+                        item, rate_limit=rate_limit, use_cloudscraper=use_cloudscraper, burst=burst
+                    )
+                entry = self._lookup_cache(item.url)
+                cached = self._fresh_entry(entry)
+                if cached is not None:
+                    yield item.url, _payload(cached)
+                else:
+                    domain = urlparse(item.url).netloc
+                    if domain not in domains:
+                        domains[domain] = queue.Queue()
+                        thread = threading.Thread(
+                            target=_drain, args=(domains[domain],), name=f"fetch-{domain}"
+                        )
+                        thread.start()
+                        threads.append(thread)
+                    domains[domain].put((item, entry))
+                    pending += 1
+                while pending:
+                    try:
+                        result = results.get_nowait()
+                    except queue.Empty:
+                        break
+                    pending -= 1
+                    yield result
+
+            for items in domains.values():
+                items.put(None)
+            while pending:
+                pending -= 1
+                yield results.get()
+        finally:
+            stop.set()
+            for items in domains.values():
+                items.put(None)
+            for thread in threads:
+                thread.join()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+
+DISCOVERED = "discovered"
+FETCHED = "fetched"
+EXTRACTED = "extracted"
+REJECTED = "rejected"
+EMITTED = "emitted"
+
+DONE_STATES = (REJECTED, EMITTED)
+TRACKING_PARAMS = ("fbclid", "gclid", "mc_cid", "mc_eid")
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonical_url(url: str) -> str:
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or "").lower()
+    if parsed.port and parsed.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parsed.port}"
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not key.startswith("utm_") and key not in TRACKING_PARAMS
+    ]
+    return urlunparse((scheme, host, parsed.path or "/", parsed.params, urlencode(query), ""))
+
+
+class Frontier:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                source TEXT,
+                state TEXT NOT NULL,
+                reason TEXT,
+                discovered_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS urls_state ON urls (state)")
+
+    def add(self, urls: Iterable[str], source: Optional[str] = None) -> None:
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO urls VALUES (?, ?, ?, NULL, ?, ?)",
+                ((canonical_url(url), source, DISCOVERED, now, now) for url in urls),
+            )
+
+    def pending(self, urls: Iterable[str]) -> List[str]:
+        candidates = list(urls)
+        done: Set[str] = set()
+        keys = [canonical_url(url) for url in candidates]
+        for start in range(0, len(keys), 500):
+            chunk = keys[start : start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = self._conn.execute(
+                f"SELECT url FROM urls WHERE url IN ({placeholders}) AND state IN (?, ?)",
+                (*chunk, *DONE_STATES),
+            ).fetchall()
+            done.update(row[0] for row in rows)
+        return [url for url, key in zip(candidates, keys) if key not in done]
+
+    def mark(self, url: str, state: str, reason: Optional[str] = None) -> None:
+        self.mark_many([url], state, reason)
+
+    def mark_many(self, urls: Iterable[str], state: str, reason: Optional[str] = None) -> None:
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE urls SET state = ?, reason = ?, updated_at = ? WHERE url = ?",
+                ((state, reason, now, canonical_url(url)) for url in urls),
+            )
+
+    def counts(self) -> Dict[str, int]:
+        rows = self._conn.execute("SELECT state, COUNT(*) FROM urls GROUP BY state").fetchall()
+        return {state: count for state, count in rows}
+
+    def close(self) -> None:
+        self._conn.close()
@@ -1,11 +1,25 @@
-from scraping.sources.common import collect_rss_entries, discover_urls, filter_sources, load_sources
-from scraping.sources.wikipedia import download_dump, iter_wikipedia_articles
+from scraping.sources.common import (
+    collect_rss_entries,
+    discover_urls,
+    filter_sources,
+    load_sources,
+    source_for_url,
+)
+from scraping.sources.wikipedia import (
+    download_dump,
+    download_dump_index,
+    iter_cached_wikipedia_articles,
+    iter_wikipedia_articles,
+)
 
 __all__ = [
     "discover_urls",
     "collect_rss_entries",
     "download_dump",
+    "download_dump_index",
     "filter_sources",
+    "iter_cached_wikipedia_articles",
     "iter_wikipedia_articles",
     "load_sources",
+    "source_for_url",
 ]
@@ -1,17 +1,34 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Any, Dict, Iterable, List, Optional
+import gzip
+import html
+import io
+import re
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple, cast
 from urllib.parse import urlparse
 import xml.etree.ElementTree as ElementTree
 
-import importlib
-
-from bs4 import BeautifulSoup
 from dateutil import parser as date_parser
+from lxml import etree
 import yaml
 
 
+GZIP_MAGIC = b"\x1f\x8b"
+SITEMAP_NAMESPACES = (
+    "",
+    "{http://www.sitemaps.org/schemas/sitemap/0.9}",
+    "{http://www.google.com/schemas/sitemap/0.84}",
+)
+FEED_ITEM_TAGS = ("item", "entry")
+FEED_DATE_TAGS = ("pubDate", "published", "updated", "date")
+FEED_CONTENT_TAGS = ("encoded", "content")
+FEED_SUMMARY_TAGS = ("description", "summary")
+HTML_STRIP_RE = re.compile(
+    r"<(script|style)\b.*?</\1\s*>|<!--.*?-->|<[^>]*>", re.IGNORECASE | re.DOTALL
+)
+
+
 def load_sources(path: str) -> List[Dict[str, Any]]:
     with open(path, "r", encoding="utf-8") as handle:
         data = yaml.safe_load(handle) or {}
@@ -62,106 +79,178 @@ def _is_allowed_domain(url: str, source: Dict[str, Any]) -> bool:
     return any(parsed.netloc.endswith(domain) for domain in allowed_domains if domain)
 
 
+def source_for_url(url: str, sources: Iterable[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    for source in sources:
+        if source.get("url") and _is_allowed_domain(url, source):
+            return source
+    return None
+
+
 def _strip_html(value: str) -> str:
     if not value:
         return ""
-    soup = BeautifulSoup(value, "html.parser")
-    return soup.get_text(" ", strip=True)
+    if "<" in value:
+        value = HTML_STRIP_RE.sub(" ", value)
+    return " ".join(html.unescape(value).split())
+
 
+def _open_sitemap(content: bytes) -> IO[bytes]:
+    if content[:2] == GZIP_MAGIC:
+        return cast(IO[bytes], gzip.GzipFile(fileobj=io.BytesIO(content)))
+    return io.BytesIO(content)
 
-def _load_feedparser():
+
+def _iter_sitemap(content: bytes) -> Iterator[Tuple[str, str, Optional[str]]]:
     try:
-        return importlib.import_module("feedparser")
-    except ImportError:
-        return None
+        for _, elem in ElementTree.iterparse(_open_sitemap(content), events=("end",)):
+            namespace, _, tag = elem.tag.rpartition("}")
+            namespace = f"{namespace}}}" if namespace else ""
+            if tag not in ("url", "sitemap") or namespace not in SITEMAP_NAMESPACES:
+                continue
+            # Only direct children count: image:loc and video:*_loc sit in nested elements.
+            loc = (elem.findtext(f"{namespace}loc") or "").strip()
+            if loc:
+                yield tag, loc, elem.findtext(f"{namespace}lastmod")
+            elem.clear()
+    except (ElementTree.ParseError, OSError, EOFError):
+        return
+
+
+def _parse_sitemap(
+    content: Optional[bytes], since: Optional[datetime]
+) -> Tuple[List[str], List[str]]:
+    urls: List[str] = []
+    children: List[str] = []
+    if not content:
+        return urls, children
+    for kind, loc, lastmod in _iter_sitemap(content):
+        if since and lastmod:
+            lastmod_date = _parse_iso_date(lastmod)
+            if lastmod_date and lastmod_date < since:
+                continue
+        if kind == "sitemap":
+            children.append(loc)
+        else:
+            urls.append(loc)
+    return urls, children
+
+
+def _fetch_options(source: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "rate_limit": source.get("rate_limit"),
+        "burst": source.get("burst"),
+        "use_cloudscraper": source.get("use_cloudscraper", False),
+    }
 
 
 def _collect_sitemap_urls(
     sitemap_url: str,
     fetcher,
     since: Optional[datetime],
-    use_cloudscraper: bool,
+    options: Dict[str, Any],
     depth: int = 0,
 ) -> List[str]:
     if depth > 2:
         return []
-    sitemap_text = fetcher.fetch(sitemap_url, use_cloudscraper=use_cloudscraper)
-    if not sitemap_text:
-        return []
+    urls, children = _parse_sitemap(fetcher.fetch_bytes(sitemap_url, **options), since)
+
+    while children and depth < 2:
+        depth += 1
+        parsed: Dict[str, Tuple[List[str], List[str]]] = {}
+        for child_url, content in fetcher.fetch_many(children, binary=True, **options):
+            parsed[child_url] = _parse_sitemap(content, since)
+        next_children: List[str] = []
+        for child_url in children:
+            child_urls, grandchildren = parsed.get(child_url, ([], []))
+            urls.extend(child_urls)
+            next_children.extend(grandchildren)
+        children = next_children
+    return urls
 
-    try:
-        root = ElementTree.fromstring(sitemap_text)
-    except ElementTree.ParseError:
-        return []
-    urls: List[str] = []
 
-    if root.tag.endswith("sitemapindex"):
-        for sitemap in root.iter():
-            if not sitemap.tag.endswith("sitemap"):
+def _local_name(tag: Any) -> str:
+    if not isinstance(tag, str):
+        return ""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _feed_item(item) -> Dict[str, Any]:
+    fields: Dict[str, str] = {}
+    link: Optional[str] = None
+    for child in item:
+        name = _local_name(child.tag)
+        if name == "link":
+            href = child.get("href")
+            if href and child.get("rel", "alternate") == "alternate":
+                link = link or href.strip()
+            elif child.text and child.text.strip():
+                link = link or child.text.strip()
+        elif name and name not in fields:
+            value = "".join(child.itertext()) if len(child) else child.text
+            if value:
+                fields[name] = value
+    link = link or (fields.get("guid") or fields.get("id") or "").strip() or None
+    published = next((fields[tag] for tag in FEED_DATE_TAGS if fields.get(tag)), None)
+    content = next((fields[tag] for tag in FEED_CONTENT_TAGS if fields.get(tag)), "")
+    if not content.strip():
+        content = next((fields[tag] for tag in FEED_SUMMARY_TAGS if fields.get(tag)), "")
+    title = fields.get("title")
+    return {
+        "url": link,
+        "title": _strip_html(title) if title else None,
+        "date": _parse_iso_date(published),
+        "content": content,
+    }
+
+
+def _parse_feed(content: Optional[bytes], since: Optional[datetime]) -> List[Dict[str, Any]]:
+    items: List[Dict[str, Any]] = []
+    if not content:
+        return items
+    try:
+        for _, elem in etree.iterparse(
+            io.BytesIO(content), events=("end",), recover=True, resolve_entities=False
+        ):
+            if _local_name(elem.tag) not in FEED_ITEM_TAGS:
                 continue
-            loc = sitemap.find("{*}loc")
-            if loc is None or not loc.text:
+            item = _feed_item(elem)
+            elem.clear()
+            if not item["url"]:
                 continue
-            urls.extend(
-                _collect_sitemap_urls(loc.text, fetcher, since, use_cloudscraper, depth + 1)
-            )
-        return urls
-
-    for url_elem in root.iter():
-        if not url_elem.tag.endswith("url"):
-            continue
-        loc = url_elem.find("{*}loc")
-        if loc is None or not loc.text:
-            continue
-        lastmod = url_elem.find("{*}lastmod")
-        if since and lastmod is not None:
-            lastmod_date = _parse_iso_date(lastmod.text)
-            if lastmod_date and lastmod_date < since:
+            if since and item["date"] and item["date"] < since:
                 continue
-        urls.append(loc.text)
-    return urls
+            items.append(item)
+    except etree.XMLSyntaxError:
+        pass
+    return items
 
 
-def _collect_rss_urls(
-    rss_url: str,
+def _collect_feed_items(
+    rss_feeds: List[str],
     fetcher,
     since: Optional[datetime],
-    use_cloudscraper: bool,
-) -> List[str]:
-    rss_text = fetcher.fetch(rss_url, use_cloudscraper=use_cloudscraper)
-    if not rss_text:
-        return []
-
-    try:
-        root = ElementTree.fromstring(rss_text)
-    except ElementTree.ParseError:
-        return []
-    urls: List[str] = []
-    for item in root.iter():
-        if not item.tag.endswith("item"):
-            continue
-        link = item.find("{*}link")
-        pub_date = item.find("{*}pubDate")
-        if since and pub_date is not None:
-            parsed = _parse_iso_date(pub_date.text or "")
-            if parsed and parsed < since:
-                continue
-        if link is not None and link.text:
-            urls.append(link.text.strip())
-    return urls
+    options: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    parsed: Dict[str, List[Dict[str, Any]]] = {}
+    for rss_url, content in fetcher.fetch_many(rss_feeds, binary=True, **options):
+        parsed[rss_url] = _parse_feed(content, since)
+    items: List[Dict[str, Any]] = []
+    for rss_url in rss_feeds:
+        items.extend(parsed.get(rss_url, []))
+    return items
 
 
 def discover_urls(source: Dict[str, Any], fetcher, since: Optional[datetime]) -> List[str]:
     urls: List[str] = []
     sitemaps = source.get("sitemaps") or _default_sitemap_urls(source["url"])
     rss_feeds = source.get("rss") or _default_rss_urls(source["url"])
-    use_cloudscraper = source.get("use_cloudscraper", False)
+    options = _fetch_options(source)
 
     for sitemap_url in sitemaps:
-        urls.extend(_collect_sitemap_urls(sitemap_url, fetcher, since, use_cloudscraper))
+        urls.extend(_collect_sitemap_urls(sitemap_url, fetcher, since, options))
 
-    for rss_url in rss_feeds:
-        urls.extend(_collect_rss_urls(rss_url, fetcher, since, use_cloudscraper))
+    for item in _collect_feed_items(rss_feeds, fetcher, since, options):
+        urls.append(item["url"])
 
     if not urls:
         urls = [source["url"]]
@@ -173,39 +262,20 @@ def discover_urls(source: Dict[str, Any], fetcher, since: Optional[datetime]) ->
 def collect_rss_entries(source: Dict[str, Any], fetcher, since: Optional[datetime]) -> List[Dict[str, Any]]:
     entries: List[Dict[str, Any]] = []
     rss_feeds = source.get("rss") or _default_rss_urls(source["url"])
-    use_cloudscraper = source.get("use_cloudscraper", False)
 
-    for rss_url in rss_feeds:
-        rss_text = fetcher.fetch(rss_url, use_cloudscraper=use_cloudscraper)
-        if not rss_text:
+    for item in _collect_feed_items(rss_feeds, fetcher, since, _fetch_options(source)):
+        if not _is_allowed_domain(item["url"], source):
             continue
-        feedparser = _load_feedparser()
-        if feedparser is None:
-            raise RuntimeError("feedparser is required for RSS content extraction")
-        feed = feedparser.parse(rss_text)
-        for item in feed.entries:
-            link = item.get("link") or item.get("id")
-            if not link or not _is_allowed_domain(link, source):
-                continue
-            published = item.get("published") or item.get("updated") or item.get("pubDate")
-            published_dt = _parse_iso_date(published)
-            if since and published_dt and published_dt < since:
-                continue
-            content_value = ""
-            if item.get("content"):
-                content_value = item.content[0].get("value", "")
-            if not content_value:
-                content_value = item.get("summary") or item.get("description") or ""
-            text = _strip_html(content_value)
-            if not text:
-                continue
-            entries.append(
-                {
-                    "text": text,
-                    "title": item.get("title"),
-                    "url": link,
-                    "date": published_dt,
-                }
-            )
+        text = _strip_html(item["content"])
+        if not text:
+            continue
+        entries.append(
+            {
+                "text": text,
+                "title": item["title"],
+                "url": item["url"],
+                "date": item["date"],
+            }
+        )
 
     return entries
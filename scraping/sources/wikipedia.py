@@ -1,13 +1,31 @@
 from __future__ import annotations
 
 import bz2
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, Optional
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import mwxml
 import mwparserfromhell
 import requests
+from lxml import etree
+
+from scraping.sources.wikitext import is_disambiguation, is_redirect, strip_wikitext
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
 
 
 @dataclass
@@ -17,24 +35,240 @@ class WikipediaDumpConfig:
     dump_file: str
     language: str
     source: str
+    index_file: Optional[str] = None
+    checksum_file: Optional[str] = None
 
 
-def download_dump(config: WikipediaDumpConfig, cache_dir: Path, user_agent: str, logger) -> Path:
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    dump_path = cache_dir / config.dump_file
-    if dump_path.exists():
-        logger.info("Using cached Wikipedia dump: %s", dump_path)
-        return dump_path
-
-    dump_url = f"{config.dump_url}{config.dump_file}"
-    logger.info("Downloading Wikipedia dump: %s", dump_url)
-    with requests.get(dump_url, stream=True, headers={"User-Agent": user_agent}, timeout=120) as response:
+CHECKSUM_ALGORITHMS = {40: "sha1", 32: "md5"}
+# Bump whenever article parsing or cleaning changes so cached plaintext is rebuilt.
+WIKI_PARSER_VERSION = "2"
+PLAINTEXT_BATCH_SIZE = 10_000
+PROGRESS_INTERVAL = 30.0
+
+
+@dataclass(frozen=True)
+class WikiParseOptions:
+    min_chars: int = 0
+    skip_redirects: bool = True
+    skip_disambiguation: bool = True
+    fast_strip: bool = False
+
+    def key(self) -> str:
+        flags = "".join(
+            "1" if flag else "0"
+            for flag in (self.skip_redirects, self.skip_disambiguation, self.fast_strip)
+        )
+        return f"{self.min_chars}-{flags}"
+
+
+def _expected_checksum(
+    config: WikipediaDumpConfig, file_name: str, user_agent: str, logger
+) -> Optional[Tuple[str, str]]:
+    if not config.checksum_file:
+        return None
+    local = Path(config.checksum_file).expanduser()
+    try:
+        if local.is_file():
+            listing = local.read_text(encoding="utf-8")
+        else:
+            response = requests.get(
+                f"{config.dump_url}{config.checksum_file}",
+                headers={"User-Agent": user_agent},
+                timeout=60,
+            )
+            response.raise_for_status()
+            listing = response.text
+    except (OSError, requests.RequestException) as exc:
+        logger.warning("Could not load checksums %s: %s", config.checksum_file, exc)
+        return None
+
+    # Checksum lists under latest/ name the dated files (bswiki-20240601-...).
+    prefix, latest, rest = file_name.partition("-latest-")
+    if latest:
+        pattern = re.compile(rf"{re.escape(prefix)}-(?:latest|\d{{8}})-{re.escape(rest)}")
+    else:
+        pattern = re.compile(re.escape(file_name))
+    for line in listing.splitlines():
+        parts = line.split()
+        if len(parts) == 2 and pattern.fullmatch(parts[1].lstrip("*")):
+            digest = parts[0].lower()
+            algorithm = CHECKSUM_ALGORITHMS.get(len(digest))
+            if algorithm:
+                return algorithm, digest
+    logger.warning("No checksum for %s in %s", file_name, config.checksum_file)
+    return None
+
+
+def _file_digest(path: Path, algorithm: str) -> str:
+    with path.open("rb") as handle:
+        return hashlib.file_digest(handle, algorithm).hexdigest()
+
+
+def _verified(path: Path, expected: Tuple[str, str], logger) -> bool:
+    marker = path.with_name(path.name + ".verified")
+    algorithm, digest = expected
+    if marker.exists() and marker.read_text(encoding="utf-8").strip() == f"{algorithm}:{digest}":
+        return True
+    logger.info("Verifying %s checksum of %s", algorithm, path.name)
+    if _file_digest(path, algorithm) != digest:
+        return False
+    marker.write_text(f"{algorithm}:{digest}\n", encoding="utf-8")
+    return True
+
+
+def _log_progress(path: Path, done: int, total: Optional[int], started: float, resumed: int, logger):
+    elapsed = max(time.monotonic() - started, 1e-6)
+    rate = (done - resumed) / elapsed / (1024 * 1024)
+    if total:
+        logger.info(
+            "%s: %.1f/%.1f MB (%.1f%%), %.1f MB/s",
+            path.name,
+            done / (1024 * 1024),
+            total / (1024 * 1024),
+            100 * done / total,
+            rate,
+        )
+    else:
+        logger.info("%s: %.1f MB, %.1f MB/s", path.name, done / (1024 * 1024), rate)
+
+
+def _validator_path(part: Path) -> Path:
+    return part.with_name(part.name + ".validator")
+
+
+def _discard_part(part: Path) -> None:
+    for path in (part, _validator_path(part), part.with_name(part.name + ".verified")):
+        path.unlink(missing_ok=True)
+
+
+def _resume_validator(part: Path) -> Optional[Dict[str, Any]]:
+    try:
+        validator = json.loads(_validator_path(part).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return validator if validator.get("if_range") else None
+
+
+def _save_validator(part: Path, response: requests.Response, total: int) -> None:
+    etag = response.headers.get("ETag", "")
+    # If-Range needs a strong validator; a weak ETag falls back to Last-Modified.
+    if_range = etag if etag and not etag.startswith("W/") else response.headers.get("Last-Modified")
+    _validator_path(part).write_text(
+        json.dumps({"if_range": if_range, "size": total}), encoding="utf-8"
+    )
+
+
+def _stream_to_part(url: str, part: Path, user_agent: str, logger) -> None:
+    offset = part.stat().st_size if part.exists() else 0
+    validator = _resume_validator(part) if offset else None
+    headers = {"User-Agent": user_agent}
+    if validator is not None:
+        # If-Range makes the server send the whole new file when the dump behind latest/ changed.
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = validator["if_range"]
+    elif offset:
+        logger.info("No validator for %s; downloading from scratch", part.name)
+        offset = 0
+
+    with requests.get(url, stream=True, headers=headers, timeout=120) as response:
+        if validator is not None and response.status_code == 416:
+            if validator.get("size") and offset == validator["size"]:
+                return
+            logger.warning("Cannot resume %s (HTTP 416); downloading from scratch", part.name)
+            _discard_part(part)
+            return _stream_to_part(url, part, user_agent, logger)
         response.raise_for_status()
-        with dump_path.open("wb") as handle:
+        if validator is not None and response.status_code == 206:
+            total = int(response.headers.get("Content-Range", "*/0").rsplit("/", 1)[-1] or 0)
+            logger.info("Resuming %s at %.1f MB", part.name, offset / (1024 * 1024))
+            mode = "ab"
+        else:
+            if offset:
+                logger.info("%s changed on the server; downloading from scratch", part.name)
+            total = int(response.headers.get("Content-Length", 0)) or 0
+            offset = 0
+            mode = "wb"
+            _save_validator(part, response, total)
+
+        done = offset
+        started = last_report = time.monotonic()
+        with part.open(mode) as handle:
             for chunk in response.iter_content(chunk_size=1024 * 1024):
-                if chunk:
-                    handle.write(chunk)
-    return dump_path
+                if not chunk:
+                    continue
+                handle.write(chunk)
+                done += len(chunk)
+                if time.monotonic() - last_report >= PROGRESS_INTERVAL:
+                    last_report = time.monotonic()
+                    _log_progress(part, done, total, started, offset, logger)
+        _log_progress(part, done, total, started, offset, logger)
+        if total and done < total:
+            raise requests.ConnectionError(f"Incomplete download: {done} of {total} bytes")
+
+
+def _download_part(
+    url: str, part: Path, file_name: str, user_agent: str, logger, max_retries: int
+) -> None:
+    for attempt in range(max_retries + 1):
+        try:
+            _stream_to_part(url, part, user_agent, logger)
+            return
+        except requests.RequestException as exc:
+            if attempt >= max_retries:
+                raise
+            logger.warning("Download of %s interrupted (%s); retrying", file_name, exc)
+            time.sleep(min(2**attempt, 60))
+
+
+def _download_file(
+    config: WikipediaDumpConfig,
+    file_name: str,
+    cache_dir: Path,
+    user_agent: str,
+    logger,
+    max_retries: int = 5,
+) -> Path:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / file_name
+    part = path.with_name(path.name + ".part")
+    expected = _expected_checksum(config, file_name, user_agent, logger)
+
+    if path.exists():
+        if expected is None or _verified(path, expected, logger):
+            logger.info("Using cached Wikipedia file: %s", path)
+            return path
+        logger.warning("Cached %s does not match its checksum; downloading again", path.name)
+        path.unlink()
+
+    url = f"{config.dump_url}{file_name}"
+    logger.info("Downloading Wikipedia file: %s", url)
+    _download_part(url, part, file_name, user_agent, logger, max_retries)
+    if expected is not None and not _verified(part, expected, logger):
+        # A resumed file can mix two dump versions; one clean download settles it.
+        logger.warning("Checksum mismatch for %s; downloading again from scratch", file_name)
+        _discard_part(part)
+        _download_part(url, part, file_name, user_agent, logger, max_retries)
+        if not _verified(part, expected, logger):
+            _discard_part(part)
+            raise RuntimeError(f"Checksum mismatch for {file_name}; partial file removed")
+    verified = part.with_name(part.name + ".verified")
+    if verified.exists():
+        verified.replace(path.with_name(path.name + ".verified"))
+    _validator_path(part).unlink(missing_ok=True)
+    part.replace(path)
+    return path
+
+
+def download_dump(config: WikipediaDumpConfig, cache_dir: Path, user_agent: str, logger) -> Path:
+    return _download_file(config, config.dump_file, cache_dir, user_agent, logger)
+
+
+def download_dump_index(
+    config: WikipediaDumpConfig, cache_dir: Path, user_agent: str, logger
+) -> Optional[Path]:
+    if not config.index_file:
+        return None
+    return _download_file(config, config.index_file, cache_dir, user_agent, logger)
 
 
 def _extract_latest_revision(page) -> Optional[str]:
@@ -46,19 +280,222 @@ def _extract_latest_revision(page) -> Optional[str]:
     return latest.text
 
 
-def iter_wikipedia_articles(dump_path: Path) -> Iterable[Dict[str, str]]:
+def _article(title: str, wikitext: str, options: WikiParseOptions) -> Optional[Dict[str, str]]:
+    if len(wikitext) < options.min_chars:
+        return None
+    if options.skip_redirects and is_redirect(wikitext):
+        return None
+    if options.skip_disambiguation and is_disambiguation(wikitext):
+        return None
+    if options.fast_strip:
+        text = strip_wikitext(wikitext)
+    else:
+        text = mwparserfromhell.parse(wikitext).strip_code()
+    return {"title": title, "text": text}
+
+
+def iter_raw_pages(dump_path: Path, skip_redirects: bool = True) -> Iterator[Tuple[str, str]]:
     with dump_path.open("rb") as handle:
         with bz2.open(handle, "rb") as decompressed:
             dump = mwxml.Dump.from_file(decompressed)
             for page in dump:
                 if page.namespace != 0:
                     continue
-                text = _extract_latest_revision(page)
-                if not text:
+                if skip_redirects and page.redirect:
                     continue
-                wikicode = mwparserfromhell.parse(text)
-                cleaned = wikicode.strip_code()
-                yield {
-                    "title": page.title,
-                    "text": cleaned,
-                }
+                text = _extract_latest_revision(page)
+                if text:
+                    yield page.title, text
+
+
+def _iter_single_stream(dump_path: Path, options: WikiParseOptions) -> Iterator[Dict[str, str]]:
+    for title, text in iter_raw_pages(dump_path, options.skip_redirects):
+        article = _article(title, text, options)
+        if article is not None:
+            yield article
+
+
+def read_stream_offsets(index_path: Path) -> List[int]:
+    offsets: List[int] = []
+    with bz2.open(index_path, "rt", encoding="utf-8") as handle:
+        for line in handle:
+            offset = int(line.split(":", 1)[0])
+            if not offsets or offset != offsets[-1]:
+                offsets.append(offset)
+    return offsets
+
+
+def _stream_blocks(dump_path: Path, offsets: List[int]) -> List[Tuple[int, int]]:
+    ends = offsets[1:] + [dump_path.stat().st_size]
+    return list(zip(offsets, ends))
+
+
+def _parse_stream_block(
+    dump_path: str, start: int, end: int, options: WikiParseOptions
+) -> List[Dict[str, str]]:
+    with open(dump_path, "rb") as handle:
+        handle.seek(start)
+        data = bz2.decompress(handle.read(end - start))
+
+    closing = data.rfind(b"</mediawiki>")
+    if closing != -1:
+        data = data[:closing]
+    parser = etree.XMLParser(huge_tree=True, resolve_entities=False)
+    root = etree.fromstring(b"<pages>" + data + b"</pages>", parser)
+
+    articles: List[Dict[str, str]] = []
+    for page in root.iterchildren("page"):
+        if page.findtext("ns") != "0":
+            continue
+        if options.skip_redirects and page.find("redirect") is not None:
+            continue
+        revisions = page.findall("revision")
+        text = revisions[-1].findtext("text") if revisions else None
+        if not text:
+            continue
+        article = _article(page.findtext("title") or "", text, options)
+        if article is not None:
+            articles.append(article)
+    return articles
+
+
+def _iter_multistream(
+    dump_path: Path, index_path: Path, workers: Optional[int], options: WikiParseOptions
+) -> Iterator[Dict[str, str]]:
+    blocks = _stream_blocks(dump_path, read_stream_offsets(index_path))
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        for start, end in blocks:
+            yield from _parse_stream_block(str(dump_path), start, end, options)
+        return
+
+    executor = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    pending: Deque[Future] = deque()
+    remaining = iter(blocks)
+    try:
+        for start, end in remaining:
+            pending.append(
+                executor.submit(_parse_stream_block, str(dump_path), start, end, options)
+            )
+            if len(pending) >= workers * 4:
+                break
+        while pending:
+            articles = pending.popleft().result()
+            next_block = next(remaining, None)
+            if next_block is not None:
+                pending.append(
+                    executor.submit(_parse_stream_block, str(dump_path), *next_block, options)
+                )
+            yield from articles
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_wikipedia_articles(
+    dump_path: Path,
+    index_path: Optional[Path] = None,
+    workers: Optional[int] = None,
+    options: Optional[WikiParseOptions] = None,
+) -> Iterable[Dict[str, str]]:
+    options = options or WikiParseOptions()
+    if index_path is not None:
+        return _iter_multistream(dump_path, index_path, workers, options)
+    return _iter_single_stream(dump_path, options)
+
+
+def plaintext_cache_path(cache_dir: Path, dump_path: Path, options: WikiParseOptions) -> Path:
+    return cache_dir / f"{dump_path.name}.v{WIKI_PARSER_VERSION}-{options.key()}.parquet"
+
+
+def _dump_signature(dump_path: Path, options: WikiParseOptions) -> Dict[bytes, bytes]:
+    stat = dump_path.stat()
+    return {
+        b"dump_file": dump_path.name.encode("utf-8"),
+        b"dump_size": str(stat.st_size).encode("ascii"),
+        b"dump_mtime_ns": str(stat.st_mtime_ns).encode("ascii"),
+        b"parser_version": WIKI_PARSER_VERSION.encode("ascii"),
+        b"parse_options": options.key().encode("ascii"),
+    }
+
+
+def _plaintext_cache_valid(cache_path: Path, dump_path: Path, options: WikiParseOptions) -> bool:
+    if not cache_path.exists():
+        return False
+    try:
+        metadata = pq.read_schema(cache_path).metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return False
+    signature = _dump_signature(dump_path, options)
+    return all(metadata.get(key) == value for key, value in signature.items())
+
+
+def _iter_plaintext_cache(cache_path: Path) -> Iterator[Dict[str, str]]:
+    parquet = pq.ParquetFile(cache_path)
+    for batch in parquet.iter_batches(batch_size=PLAINTEXT_BATCH_SIZE, columns=["title", "text"]):
+        for title, text in zip(batch.column(0).to_pylist(), batch.column(1).to_pylist()):
+            yield {"title": title, "text": text}
+
+
+def _write_plaintext_cache(
+    articles: Iterable[Dict[str, str]],
+    cache_path: Path,
+    dump_path: Path,
+    options: WikiParseOptions,
+) -> Iterator[Dict[str, str]]:
+    schema = pa.schema(
+        [("title", pa.string()), ("text", pa.string())],
+        metadata=_dump_signature(dump_path, options),
+    )
+    part = cache_path.with_name(cache_path.name + ".part")
+    writer = pq.ParquetWriter(part, schema, compression="zstd")
+    batch: List[Dict[str, str]] = []
+    complete = False
+    try:
+        for article in articles:
+            batch.append(article)
+            if len(batch) >= PLAINTEXT_BATCH_SIZE:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                batch = []
+            yield article
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+        complete = True
+    finally:
+        writer.close()
+        if complete:
+            part.replace(cache_path)
+        else:
+            part.unlink(missing_ok=True)
+
+
+def iter_cached_wikipedia_articles(
+    dump_path: Path,
+    cache_dir: Path,
+    index_path: Optional[Path] = None,
+    workers: Optional[int] = None,
+    logger=None,
+    options: Optional[WikiParseOptions] = None,
+) -> Iterable[Dict[str, str]]:
+    options = options or WikiParseOptions()
+    if pq is None:
+        if logger is not None:
+            logger.warning("pyarrow is not installed; Wikipedia plaintext cache disabled")
+        return iter_wikipedia_articles(dump_path, index_path, workers, options)
+
+    cache_path = plaintext_cache_path(cache_dir, dump_path, options)
+    if _plaintext_cache_valid(cache_path, dump_path, options):
+        if logger is not None:
+            logger.info("Reading Wikipedia plaintext cache: %s", cache_path)
+        return _iter_plaintext_cache(cache_path)
+
+    for stale in cache_dir.glob(f"{dump_path.name}.v*.parquet"):
+        if stale != cache_path:
+            stale.unlink()
+    return _write_plaintext_cache(
+        iter_wikipedia_articles(dump_path, index_path, workers, options),
+        cache_path,
+        dump_path,
+        options,
+    )
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import html
+import re
+from typing import List, Tuple
+
+
+REDIRECT_RE = re.compile(
+    r"\s*#\s*(?:redirect|preusmjeri|preusmeri|преусмери|преусмјери)\b", re.IGNORECASE
+)
+DISAMBIGUATION_RE = re.compile(
+    r"__DISAMBIG__|\{\{\s*(?:disambig\w*|dab|višeznačna odrednica|вишезначна одредница"
+    r"|razdvojba|čvor|razvrstavanje)\s*[|}]",
+    re.IGNORECASE,
+)
+
+COMMENT_RE = re.compile(r"<!--.*?(?:-->|$)", re.DOTALL)
+REF_RE = re.compile(r"<ref\b[^>]*/>|<ref\b[^>]*>.*?</ref\s*>", re.DOTALL | re.IGNORECASE)
+INVISIBLE_TAG_RE = re.compile(
+    r"<(categorytree|gallery|graph|imagemap|inputbox|math|score|section|templatedata|timeline)"
+    r"\b[^>]*>.*?</\1\s*>",
+    re.DOTALL | re.IGNORECASE,
+)
+NESTED_TOKEN_RE = re.compile(r"\{\{|\}\}|\[\[|\]\]|^[ \t]*\{\||^[ \t]*\|\}", re.MULTILINE)
+EXTERNAL_LINK_RE = re.compile(r"\[(?:https?:)?//[^\s\]]+(?:[ \t]+([^\]\n]*))?\]")
+HTML_TAG_RE = re.compile(r"</?[a-zA-Z][^>]*>")
+QUOTES_RE = re.compile(r"'{2,5}")
+HEADING_RE = re.compile(r"^(=+)[ \t]*(.*?)[ \t]*\1[ \t]*$", re.MULTILINE)
+LIST_MARKER_RE = re.compile(r"^[*#:;]+[ \t]*", re.MULTILINE)
+MAGIC_WORD_RE = re.compile(r"__[A-ZÀ-ŽА-Я]+__")
+BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+# Links into these namespaces carry no prose (images, categories, interwiki).
+HIDDEN_LINK_PREFIXES = {
+    "file",
+    "image",
+    "media",
+    "category",
+    "datoteka",
+    "slika",
+    "kategorija",
+    "датотека",
+    "слика",
+    "категорија",
+}
+INTERWIKI_RE = re.compile(r"[a-z]{2,3}(?:-[a-z]+)?$")
+
+
+def is_redirect(wikitext: str) -> bool:
+    return bool(REDIRECT_RE.match(wikitext))
+
+
+def is_disambiguation(wikitext: str) -> bool:
+    return bool(DISAMBIGUATION_RE.search(wikitext))
+
+
+def _link_text(inner: str) -> str:
+    target, pipe, label = inner.partition("|")
+    prefix, colon, _ = target.partition(":")
+    if colon and not target.startswith(":"):
+        namespace = prefix.strip().lower()
+        if namespace in HIDDEN_LINK_PREFIXES or INTERWIKI_RE.match(namespace):
+            return ""
+    if pipe:
+        return label
+    return target.lstrip(":")
+
+
+def _strip_nested(text: str) -> str:
+    # Each open {{, {| or [[ starts a new buffer; closing it folds the buffer into its parent.
+    stack: List[Tuple[str, List[str]]] = [("", [])]
+    position = 0
+    for match in NESTED_TOKEN_RE.finditer(text):
+        stack[-1][1].append(text[position : match.start()])
+        position = match.end()
+        token = match.group().strip()
+        kind = stack[-1][0]
+        if token in ("{{", "{|", "[["):
+            stack.append((token, []))
+        elif len(stack) > 1 and (kind, token) in (("{{", "}}"), ("{|", "|}"), ("[[", "]]")):
+            _, parts = stack.pop()
+            if token == "]]":
+                stack[-1][1].append(_link_text("".join(parts)))
+        else:
+            stack[-1][1].append(match.group())
+    stack[-1][1].append(text[position:])
+
+    while len(stack) > 1:
+        kind, parts = stack.pop()
+        if kind == "[[":
+            stack[-1][1].append(_link_text("".join(parts)))
+    return "".join(stack[0][1])
+
+
+def strip_wikitext(wikitext: str) -> str:
+    text = COMMENT_RE.sub("", wikitext)
+    text = INVISIBLE_TAG_RE.sub("", text)
+    text = REF_RE.sub("", text)
+    text = _strip_nested(text)
+    text = EXTERNAL_LINK_RE.sub(lambda match: match.group(1) or "", text)
+    text = HTML_TAG_RE.sub("", text)
+    text = QUOTES_RE.sub("", text)
+    text = HEADING_RE.sub(r"\2", text)
+    text = LIST_MARKER_RE.sub("", text)
+    text = MAGIC_WORD_RE.sub("", text)
+    text = html.unescape(text)
+    return BLANK_LINES_RE.sub("\n\n", text).strip("\n")
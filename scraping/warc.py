@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import base64
+import gzip
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from hashlib import sha1
+from http.client import responses as http_reasons
+from pathlib import Path
+from typing import IO, Dict, Iterable, Iterator, List, Optional, cast
+from uuid import uuid4
+
+from requests.structures import CaseInsensitiveDict
+
+from scraping.cache import CacheEntry
+
+
+SKIPPED_HEADERS = {"content-encoding", "transfer-encoding", "content-length"}
+
+
+@dataclass
+class WarcRecord:
+    url: str
+    content: bytes
+    status: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    date: Optional[str] = None
+
+    @property
+    def encoding(self) -> str:
+        content_type = CaseInsensitiveDict(self.headers).get("Content-Type", "")
+        for part in content_type.split(";")[1:]:
+            key, _, value = part.strip().partition("=")
+            if key.lower() == "charset" and value:
+                return value.strip("\"'")
+        return "utf-8"
+
+    @property
+    def text(self) -> str:
+        try:
+            return self.content.decode(self.encoding, errors="replace")
+        except LookupError:
+            return self.content.decode("utf-8", errors="replace")
+
+
+def _payload_digest(content: bytes) -> str:
+    return "sha1:" + base64.b32encode(sha1(content).digest()).decode("ascii")
+
+
+def _http_block(entry: CacheEntry) -> bytes:
+    reason = http_reasons.get(entry.status, "")
+    lines = [f"HTTP/1.1 {entry.status} {reason}".rstrip()]
+    for key, value in entry.headers.items():
+        if key.lower() in SKIPPED_HEADERS:
+            continue
+        lines.append(f"{key}: {value}")
+    lines.append(f"Content-Length: {len(entry.content)}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1", errors="replace") + entry.content
+
+
+class WarcWriter:
+    def __init__(self, output_dir: Path, prefix: str = "crawl", max_bytes: int = 1024**3) -> None:
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._handle: Optional[IO[bytes]] = None
+        self._index: Optional[IO[str]] = None
+        self._path: Optional[Path] = None
+
+    def _rotate(self) -> None:
+        self._close_files()
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S%f")
+        self._path = self.output_dir / f"{self.prefix}-{stamp}.warc.gz"
+        self._handle = self._path.open("ab")
+        self._index = self._path.with_suffix("").with_suffix(".cdx").open("a", encoding="utf-8")
+        self._index.write(" CDX N b a m s k r M S V g\n")
+
+    def write(self, entry: CacheEntry) -> None:
+        block = _http_block(entry)
+        fetched = datetime.fromtimestamp(entry.fetched_at, tz=timezone.utc)
+        digest = _payload_digest(entry.content)
+        header = "\r\n".join(
+            [
+                "WARC/1.1",
+                "WARC-Type: response",
+                f"WARC-Record-ID: <urn:uuid:{uuid4()}>",
+                f"WARC-Date: {fetched.strftime('%Y-%m-%dT%H:%M:%SZ')}",
+                f"WARC-Target-URI: {entry.url}",
+                f"WARC-Payload-Digest: {digest}",
+                "Content-Type: application/http;msgtype=response",
+                f"Content-Length: {len(block)}",
+            ]
+        )
+        record = gzip.compress(header.encode("utf-8") + b"\r\n\r\n" + block + b"\r\n\r\n")
+        mime = CaseInsensitiveDict(entry.headers).get("Content-Type", "-").split(";")[0].strip()
+
+        with self._lock:
+            if self._handle is None or self._handle.tell() >= self.max_bytes:
+                self._rotate()
+            assert self._handle is not None and self._index is not None and self._path is not None
+            offset = self._handle.tell()
+            self._handle.write(record)
+            self._index.write(
+                " ".join(
+                    [
+                        entry.url.lower(),
+                        fetched.strftime("%Y%m%d%H%M%S"),
+                        entry.url,
+                        mime or "-",
+                        str(entry.status),
+                        digest.split(":", 1)[1],
+                        "-",
+                        "-",
+                        str(len(record)),
+                        str(offset),
+                        self._path.name,
+                    ]
+                )
+                + "\n"
+            )
+
+    def _close_files(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_files()
+
+
+def _read_headers(handle: IO[bytes]) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    while True:
+        line = handle.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+        key, _, value = line.decode("utf-8", errors="replace").partition(":")
+        headers[key.strip()] = value.strip()
+
+
+def _parse_http_block(block: bytes) -> tuple[int, Dict[str, str], bytes]:
+    head, _, body = block.partition(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    parts = lines[0].split(" ", 2)
+    status = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
+    headers: Dict[str, str] = {}
+    for line in lines[1:]:
+        key, _, value = line.partition(":")
+        headers[key.strip()] = value.strip()
+    return status, headers, body
+
+
+def list_warc_files(paths: Iterable[Path]) -> List[Path]:
+    files: List[Path] = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(path.glob("*.warc.gz")))
+            files.extend(sorted(path.glob("*.warc")))
+        else:
+            files.append(path)
+    return files
+
+
+def _open_warc(path: Path) -> IO[bytes]:
+    if path.suffix == ".gz":
+        return cast(IO[bytes], gzip.open(path, "rb"))
+    return path.open("rb")
+
+
+def iter_warc_records(paths: Iterable[Path]) -> Iterator[WarcRecord]:
+    for path in list_warc_files(paths):
+        with _open_warc(path) as handle:
+            while True:
+                line = handle.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                if not line.startswith(b"WARC/"):
+                    raise ValueError(f"Malformed WARC record in {path}")
+                headers = CaseInsensitiveDict(_read_headers(handle))
+                block = handle.read(int(headers.get("Content-Length", 0)))
+                if headers.get("WARC-Type") != "response":
+                    continue
+                status, http_headers, body = _parse_http_block(block)
+                yield WarcRecord(
+                    url=headers.get("WARC-Target-URI", ""),
+                    content=body,
+                    status=status,
+                    headers=http_headers,
+                    date=headers.get("WARC-Date"),
+                )
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import typer
+
+from scraping.cache import CacheStats
+from scraping.fetch import build_fetch_config, open_cache
+from utils.config import load_config
+from utils.logging import setup_logging
+
+
+app = typer.Typer(help="Inspect and maintain the fetch cache.")
+
+
+def _format_mb(value: int) -> str:
+    return f"{value / (1024 * 1024):.1f} MB"
+
+
+def _log_stats(stats: CacheStats, logger) -> None:
+    logger.info("Entries: %s (expired: %s)", stats.entries, stats.expired)
+    for url_class, count in sorted(stats.by_class.items()):
+        logger.info("  %s: %s", url_class, count)
+    logger.info("Raw bytes: %s", _format_mb(stats.raw_bytes))
+    logger.info("Stored bytes: %s", _format_mb(stats.stored_bytes))
+    logger.info("On disk: %s", _format_mb(stats.file_bytes))
+
+
+@app.command()
+def stats(
+    config_path: Path = typer.Option(
+        Path("datasets/clean_text/config.yaml"),
+        "--config",
+        help="Path to dataset config.",
+    ),
+) -> None:
+    config = load_config(config_path)
+    logger = setup_logging(level=config.get("logging", {}).get("level", "INFO"))
+    cache = open_cache(build_fetch_config(config.get("collection", {})))
+    try:
+        _log_stats(cache.stats(), logger)
+    finally:
+        cache.close()
+
+
+@app.command()
+def compact(
+    config_path: Path = typer.Option(
+        Path("datasets/clean_text/config.yaml"),
+        "--config",
+        help="Path to dataset config.",
+    ),
+) -> None:
+    config = load_config(config_path)
+    logger = setup_logging(level=config.get("logging", {}).get("level", "INFO"))
+    cache = open_cache(build_fetch_config(config.get("collection", {})))
+    try:
+        logger.info("Compacting fetch cache (dropping expired entries, enforcing size budget)")
+        _log_stats(cache.compact(), logger)
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    app()
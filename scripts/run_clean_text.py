@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta, timezone
+from functools import partial
 import gzip
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Any, Callable, Dict, Generator, Iterable, Iterator, List, Optional
 from uuid import uuid4
 from urllib.parse import urlparse
 
@@ -11,24 +14,42 @@ import json
 import typer
 from dateutil import parser as date_parser
 
-from export.hf_upload import upload_dataset
-from export.to_jsonl import export_jsonl
-from export.to_parquet import export_parquet
-from processing.cleaning import clean_document, passes_quality_checks
-from processing.deduplication import deduplicate_documents
-from processing.language_check import validate_language
-from processing.normalization import normalize_document
-from processing.splitting import split_dataset
-from scraping.extract import extract_article
-from scraping.fetch import FetchConfig, Fetcher
-from scraping.sources.common import collect_rss_entries, discover_urls, filter_sources, load_sources
-from scraping.sources.wikipedia import WikipediaDumpConfig, download_dump, iter_wikipedia_articles
+from export.hf_upload import upload_dataset_files
+from export.sharded import ShardedWriter
+from processing.cleaning import compile_cleaner
+from processing.deduplication import iter_deduplicated
+from processing.pipeline import process_documents
+from processing.splitting import split_for
+from scraping.extract import compile_selectors, extract_many
+from scraping.extract_cache import ExtractionCache
+from scraping.fetch import Fetcher, FetchRequest, build_fetch_config
+from scraping.cache import classify_url
+from scraping.frontier import EMITTED, EXTRACTED, FETCHED, REJECTED, Frontier
+from scraping.sources.common import (
+    collect_rss_entries,
+    discover_urls,
+    filter_sources,
+    load_sources,
+    source_for_url,
+)
+from scraping.sources.wikipedia import (
+    WikiParseOptions,
+    WikipediaDumpConfig,
+    download_dump,
+    download_dump_index,
+    iter_cached_wikipedia_articles,
+    iter_wikipedia_articles,
+)
+from scraping.warc import iter_warc_records
 from utils.config import load_config
 from utils.logging import setup_logging
 
 
 app = typer.Typer(help="Run the Phase 1 clean-text pipeline.")
 
+SPLIT_NAMES = ("train", "validation", "test")
+EMIT_BATCH_SIZE = 500
+
 
 def _parse_since(value: Optional[str]) -> Optional[datetime]:
     if not value:
@@ -70,90 +91,229 @@ def _format_date(value: Optional[datetime | date | str]) -> Optional[str]:
 
 
 def _build_fetcher(config: Dict, logger) -> Fetcher:
+    return Fetcher(build_fetch_config(config.get("collection", {})), logger)
+
+
+def _news_document(entry: Dict, source: Dict) -> Dict:
+    return {
+        "text": entry["text"],
+        "title": entry.get("title"),
+        "date": _format_date(entry.get("date")),
+        "url": entry.get("url"),
+        "source": urlparse(source.get("url", "")).netloc,
+        "language": source.get("language"),
+        "domain": source.get("type"),
+    }
+
+
+def _discover_source(source: Dict, fetcher: Fetcher, since: Optional[datetime]) -> List:
+    if source.get("rss_use_content"):
+        return collect_rss_entries(source, fetcher, since)
+    return discover_urls(source, fetcher, since)
+
+
+def _discover_sources(
+    sources: List[Dict],
+    fetcher: Fetcher,
+    since: Optional[datetime],
+) -> Iterator[tuple[Dict, List]]:
+    workers = max(1, min(fetcher.config.max_workers, len(sources)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="discover") as executor:
+        discovered = executor.map(lambda source: _discover_source(source, fetcher, since), sources)
+        yield from zip(sources, discovered)
+
+
+def _open_extraction_cache(config: Dict) -> Optional[ExtractionCache]:
     collection = config.get("collection", {})
-    fetch_config = FetchConfig(
-        user_agent=collection.get("user_agent", "BalkanNLP/1.0"),
-        timeout=collection.get("timeout", 30),
-        max_retries=collection.get("max_retries", 3),
-        respect_robots_txt=collection.get("respect_robots_txt", True),
-        cache_enabled=collection.get("cache_enabled", True),
-        cache_dir=Path(collection.get("cache_dir", "./cache")),
+    if not collection.get("extraction_cache", False):
+        return None
+    cache_dir = Path(collection.get("cache_dir", "./cache"))
+    return ExtractionCache(
+        Path(collection.get("extraction_cache_path", cache_dir / "extractions.sqlite3"))
     )
-    return Fetcher(fetch_config, logger)
 
 
-def _collect_news_documents(
-    source: Dict,
+def _close_extraction_cache(cache: Optional[ExtractionCache], logger) -> None:
+    if cache is None:
+        return
+    logger.info("Extraction cache: %s hits, %s misses", cache.hits, cache.misses)
+    cache.close()
+
+
+def _track_fetched(
+    pages: Iterable[tuple[str, Optional[str]]], frontier: Frontier
+) -> Iterator[tuple[str, Optional[str]]]:
+    for url, html in pages:
+        if html:
+            frontier.mark(url, FETCHED)
+        yield url, html
+
+
+def _iter_news_documents(
+    sources: List[Dict],
     fetcher: Fetcher,
     since: Optional[datetime],
     limit: Optional[int],
-    default_rate_limit: float,
+    config: Dict,
     logger,
-) -> List[Dict]:
-    if not source.get("url"):
-        logger.warning("Missing URL for source %s", source.get("name"))
-        return []
-    documents: List[Dict] = []
+    frontier: Optional[Frontier] = None,
+) -> Iterator[Dict]:
+    collection = config.get("collection", {})
+    default_rate_limit = collection.get("default_rate_limit", 1)
+    fetch_requests: List[FetchRequest] = []
+    url_sources: Dict[str, Dict] = {}
+
+    valid_sources: List[Dict] = []
+    for source in sources:
+        if not source.get("url"):
+            logger.warning("Missing URL for source %s", source.get("name"))
+            continue
+        valid_sources.append(source)
+
+    for source, discovered in _discover_sources(valid_sources, fetcher, since):
+        if source.get("rss_use_content"):
+            entries = discovered
+            if frontier is not None:
+                frontier.add((entry["url"] for entry in entries), source.get("name"))
+                pending = set(frontier.pending(entry["url"] for entry in entries))
+                entries = [entry for entry in entries if entry["url"] in pending]
+            if limit:
+                entries = entries[:limit]
+            for entry in entries:
+                yield _news_document(entry, source)
+            continue
 
-    if source.get("rss_use_content"):
-        entries = collect_rss_entries(source, fetcher, since)
+        urls = discovered
+        if frontier is not None:
+            frontier.add(urls, source.get("name"))
+            urls = frontier.pending(urls)
         if limit:
-            entries = entries[:limit]
-        source_domain = urlparse(source.get("url", "")).netloc
-        for entry in entries:
-            documents.append(
-                {
-                    "text": entry["text"],
-                    "title": entry.get("title"),
-                    "date": _format_date(entry.get("date")),
-                    "url": entry.get("url"),
-                    "source": source_domain,
-                    "language": source.get("language"),
-                    "domain": source.get("type"),
-                }
+            urls = urls[:limit]
+        logger.info("Discovered %s URLs for %s", len(urls), source.get("name"))
+        for url in urls:
+            if url in url_sources:
+                continue
+            url_sources[url] = source
+            fetch_requests.append(
+                FetchRequest(
+                    url,
+                    rate_limit=source.get("rate_limit", default_rate_limit),
+                    use_cloudscraper=source.get("use_cloudscraper", False),
+                    burst=source.get("burst"),
+                )
             )
-        return documents
 
-    urls = discover_urls(source, fetcher, since)
-    if limit:
-        urls = urls[:limit]
-    logger.info("Discovered %s URLs for %s", len(urls), source.get("name"))
+    pages = fetcher.fetch_many(fetch_requests, queue_size=collection.get("fetch_queue_size", 64))
+    if frontier is not None:
+        pages = _track_fetched(pages, frontier)
+    extraction_cache = _open_extraction_cache(config)
+    try:
+        for url, extracted in extract_many(
+            pages,
+            logger,
+            max_workers=collection.get("extract_workers"),
+            max_pending=collection.get("extract_queue_size"),
+            cache=extraction_cache,
+            selectors_for=lambda url: url_sources[url].get("extract"),
+        ):
+            if not extracted or not extracted.get("text"):
+                if frontier is not None:
+                    frontier.mark(url, REJECTED, "extraction_empty")
+                continue
+            if frontier is not None:
+                frontier.mark(url, EXTRACTED)
+            yield _news_document(extracted, url_sources[url])
+    finally:
+        _close_extraction_cache(extraction_cache, logger)
 
-    source_domain = urlparse(source.get("url", "")).netloc
-    for url in urls:
-        html = fetcher.fetch(
-            url,
-            rate_limit=source.get("rate_limit", default_rate_limit),
-            use_cloudscraper=source.get("use_cloudscraper", False),
-        )
-        if not html:
+
+def _source_selectors(sources: List[Dict], url: str) -> Optional[Dict]:
+    source = source_for_url(url, sources)
+    return source.get("extract") if source else None
+
+
+def _validate_selectors(sources: List[Dict]) -> None:
+    for source in sources:
+        if not source.get("extract"):
             continue
-        extracted = extract_article(html, url)
-        if not extracted or not extracted.get("text"):
+        try:
+            compile_selectors(source["extract"])
+        except Exception as exc:
+            raise typer.BadParameter(
+                f"Invalid extract selectors for source {source.get('name')}: {exc}"
+            ) from exc
+
+
+def _validate_cleaning(config: Dict) -> None:
+    try:
+        compile_cleaner(config.get("cleaning", {}))
+    except ValueError as exc:
+        raise typer.BadParameter(f"Invalid cleaning.exclude_patterns: {exc}") from exc
+
+
+def _iter_warc_pages(paths: List[Path], limit: Optional[int]) -> Iterator[tuple[str, str]]:
+    count = 0
+    for record in iter_warc_records(paths):
+        if record.status != 200 or classify_url(record.url) != "article":
             continue
-        documents.append(
-            {
-                "text": extracted["text"],
-                "title": extracted.get("title"),
-                "date": _format_date(extracted.get("date")),
-                "url": extracted.get("url"),
-                "source": source_domain,
-                "language": source.get("language"),
-                "domain": source.get("type"),
-            }
-        )
-    return documents
+        if limit and count >= limit:
+            return
+        count += 1
+        yield record.url, record.text
 
 
-def _collect_wikipedia_documents(
+def _iter_warc_documents(
+    paths: List[Path],
+    sources: List[Dict],
+    limit: Optional[int],
+    config: Dict,
+    logger,
+) -> Iterator[Dict]:
+    collection = config.get("collection", {})
+    unmatched = 0
+    extraction_cache = _open_extraction_cache(config)
+    try:
+        for url, extracted in extract_many(
+            _iter_warc_pages(paths, limit),
+            logger,
+            max_workers=collection.get("extract_workers"),
+            max_pending=collection.get("extract_queue_size"),
+            cache=extraction_cache,
+            selectors_for=partial(_source_selectors, sources),
+        ):
+            if not extracted or not extracted.get("text"):
+                continue
+            source = source_for_url(url, sources)
+            if source is None:
+                unmatched += 1
+                continue
+            yield _news_document(extracted, source)
+    finally:
+        _close_extraction_cache(extraction_cache, logger)
+    if unmatched:
+        logger.info("Skipped %s WARC records that match no enabled source", unmatched)
+
+
+def _wiki_parse_options(collection: Dict) -> WikiParseOptions:
+    return WikiParseOptions(
+        min_chars=int(collection.get("wiki_min_chars", 0) or 0),
+        skip_redirects=collection.get("wiki_skip_redirects", True),
+        skip_disambiguation=collection.get("wiki_skip_disambiguation", True),
+        fast_strip=collection.get("wiki_fast_strip", False),
+    )
+
+
+def _iter_wikipedia_documents(
     source: Dict,
     fetcher: Fetcher,
     limit: Optional[int],
+    config: Dict,
     logger,
-) -> List[Dict]:
+) -> Iterator[Dict]:
+    collection = config.get("collection", {})
     if not source.get("dump_url") or not source.get("dump_file"):
         logger.warning("Missing dump configuration for %s", source.get("name"))
-        return []
+        return
 
     dump_config = WikipediaDumpConfig(
         url=str(source.get("url")),
@@ -161,27 +321,34 @@ def _collect_wikipedia_documents(
         dump_file=str(source.get("dump_file")),
         language=str(source.get("language")),
         source=str(source.get("url")),
+        index_file=source.get("index_file"),
+        checksum_file=source.get("checksum_file"),
     )
     cache_dir = Path(fetcher.config.cache_dir) / "wikipedia"
     dump_path = download_dump(dump_config, cache_dir, fetcher.config.user_agent, logger)
-    documents: List[Dict] = []
+    index_path = download_dump_index(dump_config, cache_dir, fetcher.config.user_agent, logger)
     source_domain = urlparse(source.get("url", "")).netloc
-    for idx, article in enumerate(iter_wikipedia_articles(dump_path)):
+    workers = collection.get("wiki_workers")
+    options = _wiki_parse_options(collection)
+    if collection.get("wiki_plaintext_cache", True):
+        articles = iter_cached_wikipedia_articles(
+            dump_path, cache_dir, index_path, workers, logger, options
+        )
+    else:
+        articles = iter_wikipedia_articles(dump_path, index_path, workers, options)
+    for idx, article in enumerate(articles):
         if limit and idx >= limit:
             break
         url_title = article["title"].replace(" ", "_")
-        documents.append(
-            {
-                "text": article["text"],
-                "title": article.get("title"),
-                "date": None,
-                "url": f"{source.get('url')}/wiki/{url_title}",
-                "source": source_domain,
-                "language": source.get("language"),
-                "domain": source.get("type"),
-            }
-        )
-    return documents
+        yield {
+            "text": article["text"],
+            "title": article.get("title"),
+            "date": None,
+            "url": f"{source.get('url')}/wiki/{url_title}",
+            "source": source_domain,
+            "language": source.get("language"),
+            "domain": source.get("type"),
+        }
 
 
 def _apply_processing_pipeline(
@@ -189,37 +356,119 @@ def _apply_processing_pipeline(
     config: Dict,
     logger,
     assign_ids: bool = True,
-) -> List[Dict]:
-    cleaned_docs: List[Dict] = []
-    cleaning_config = config.get("cleaning", {})
-    quality_config = config.get("quality", {})
-    language_config = config.get("language_assignment", {})
-
-    for doc in documents:
-        text = clean_document(doc["text"], cleaning_config)
-        text = normalize_document(text, cleaning_config)
-        if not passes_quality_checks(text, cleaning_config, quality_config):
-            continue
-        doc["text"] = text
-        if not doc.get("language"):
-            continue
-        if not validate_language(doc, language_config, logger):
+    on_reject: Optional[Callable[[Dict, str], None]] = None,
+    workers: int = 1,
+) -> Iterator[Dict]:
+    for doc, reason in process_documents(documents, config, logger, workers=workers):
+        if reason is not None:
+            if on_reject:
+                on_reject(doc, reason)
             continue
         if assign_ids:
             doc["id"] = str(uuid4())
-        cleaned_docs.append(doc)
+        yield doc
+
+
+def _counted(
+    documents: Iterable[Dict], counts: Counter, name: str
+) -> Generator[Dict, None, None]:
+    for doc in documents:
+        counts[name] += 1
+        yield doc
+
+
+def _iter_collected_documents(
+    wiki_sources: List[Dict],
+    news_sources: List[Dict],
+    fetcher: Fetcher,
+    since: Optional[datetime],
+    limit: Optional[int],
+    from_warc: Optional[List[Path]],
+    config: Dict,
+    logger,
+    frontier: Optional[Frontier] = None,
+) -> Iterator[Dict]:
+    for src in wiki_sources:
+        if from_warc:
+            logger.info("Skipping Wikipedia source %s in --from-warc mode", src.get("name"))
+            continue
+        yield from _iter_wikipedia_documents(src, fetcher, limit, config, logger)
+
+    if from_warc:
+        yield from _iter_warc_documents(from_warc, news_sources, limit, config, logger)
+    else:
+        yield from _iter_news_documents(
+            news_sources, fetcher, since, limit, config, logger, frontier
+        )
+
+
+def _open_frontier(config: Dict, full: bool) -> Optional[Frontier]:
+    collection = config.get("collection", {})
+    if full or not collection.get("frontier_enabled", False):
+        return None
+    cache_dir = Path(collection.get("cache_dir", "./cache"))
+    return Frontier(Path(collection.get("frontier_path", cache_dir / "frontier.sqlite3")))
+
+
+def _reject_in_frontier(frontier: Frontier, doc: Dict, reason: str) -> None:
+    if doc.get("url"):
+        frontier.mark(doc["url"], REJECTED, reason)
+
+
+def _defer_in_frontier(frontier: Frontier, doc: Dict, reason: str) -> None:
+    # Quality and language verdicts depend on thresholds that change between runs, so the URL
+    # is kept eligible instead of being marked as terminally rejected.
+    if doc.get("url"):
+        frontier.mark(doc["url"], EXTRACTED, reason)
+
 
-    return cleaned_docs
+def _track_emitted(documents: Iterable[Dict], frontier: Optional[Frontier]) -> Iterator[Dict]:
+    if frontier is None:
+        yield from documents
+        return
+    emitted: List[str] = []
+    try:
+        for doc in documents:
+            yield doc
+            if doc.get("url"):
+                emitted.append(doc["url"])
+            if len(emitted) >= EMIT_BATCH_SIZE:
+                frontier.mark_many(emitted, EMITTED)
+                emitted = []
+    finally:
+        frontier.mark_many(emitted, EMITTED)
+
+
+def _close_frontier(frontier: Optional[Frontier], logger) -> None:
+    if frontier is None:
+        return
+    logger.info("Frontier states: %s", frontier.counts())
+    frontier.close()
 
 
-def _load_documents_from_path(path: Path, logger) -> List[Dict]:
+def _input_files(path: Path) -> List[Path]:
     if not path.exists():
         raise typer.BadParameter(f"Missing input file: {path}")
+    if not path.is_dir():
+        return [path]
+    for pattern in ("*.jsonl.gz", "*.jsonl", "*.parquet"):
+        files = sorted(path.glob(pattern))
+        if files:
+            return files
+    raise typer.BadParameter(f"No jsonl or parquet files in {path}")
+
+
+def _iter_documents_from_path(path: Path, logger) -> Iterator[Dict]:
+    count = 0
     if path.suffix == ".parquet":
-        import pandas as pd
+        import pyarrow.parquet as pq
 
-        frame = pd.read_parquet(path)
-        return frame.to_dict(orient="records")
+        for batch in pq.ParquetFile(path).iter_batches():
+            for row in batch.to_pylist():
+                count += 1
+                yield row
+        logger.info("Loaded %s documents from %s", count, path)
+        return
     if path.suffix == ".gz":
         opener = gzip.open
     elif path.suffix == ".jsonl":
@@ -227,80 +476,145 @@ def _load_documents_from_path(path: Path, logger) -> List[Dict]:
     else:
         raise typer.BadParameter(f"Unsupported input format: {path}")
 
-    documents: List[Dict] = []
     with opener(path, "rt", encoding="utf-8") as handle:
         for line in handle:
             line = line.strip()
             if not line:
                 continue
-            documents.append(json.loads(line))
-    logger.info("Loaded %s documents from %s", len(documents), path)
-    return documents
+            count += 1
+            yield json.loads(line)
+    logger.info("Loaded %s documents from %s", count, path)
+
+
+def _merge_input_files(paths: List[Path], output_dir: Path) -> List[Path]:
+    files = [file_path for path in paths for file_path in _input_files(path)]
+    # Split writers clear their shards in output_dir before the lazy readers get to them.
+    for file_path in files:
+        if file_path.resolve().parent == output_dir.resolve():
+            raise typer.BadParameter(
+                f"--merge-inputs file {file_path} is in the output directory {output_dir}"
+            )
+    return files
 
 
-def _load_merge_inputs(paths: List[Path], logger) -> List[Dict]:
-    documents: List[Dict] = []
-    for path in paths:
-        documents.extend(_load_documents_from_path(path, logger))
-    return documents
+def _iter_merge_inputs(files: List[Path], logger) -> Iterator[Dict]:
+    for file_path in files:
+        yield from _iter_documents_from_path(file_path, logger)
 
 
-def _assign_ids(documents: Iterable[Dict]) -> List[Dict]:
-    updated: List[Dict] = []
+def _assign_ids(documents: Iterable[Dict]) -> Iterator[Dict]:
     for doc in documents:
         doc["id"] = str(uuid4())
-        updated.append(doc)
-    return updated
+        yield doc
 
 
-def _export_splits(splits: Dict[str, List[Dict]], config: Dict, logger) -> None:
+def _sharded_writer(
+    config: Dict, output_dir: Path, name: str, append: bool = False
+) -> ShardedWriter:
     output_config = config.get("output", {})
-    output_dir = Path(output_config.get("output_dir", "./output/clean_text"))
-    formats = output_config.get("formats", ["jsonl"])
-    compression = output_config.get("compression")
+    return ShardedWriter(
+        output_dir,
+        name,
+        formats=output_config.get("formats", ["jsonl"]),
+        compression=output_config.get("compression"),
+        shard_size=output_config.get("shard_size", 100_000),
+        append=append,
+    )
 
-    for split_name, items in splits.items():
-        if "jsonl" in formats:
-            export_jsonl(items, str(output_dir / f"{split_name}.jsonl"), compression)
-        if "parquet" in formats:
-            export_parquet(items, str(output_dir / f"{split_name}.parquet"), compression)
-        logger.info("Exported %s items for %s", len(items), split_name)
 
+def _export_splits(
+    documents: Iterable[Dict], config: Dict, logger, append: bool = False
+) -> Dict[str, Dict[str, List[Path]]]:
+    output_dir = Path(config.get("output", {}).get("output_dir", "./output/clean_text"))
+    split_config = config.get("splits", {})
+    writers = {name: _sharded_writer(config, output_dir, name, append) for name in SPLIT_NAMES}
+    stats: Dict[str, Dict[str, Any]] = {
+        name: {"count": 0, "languages": Counter(), "total_length": 0} for name in SPLIT_NAMES
+    }
 
-def _export_raw_documents(documents: List[Dict], config: Dict, suffix: str, logger) -> None:
+    try:
+        for doc in documents:
+            split_name = split_for(doc, split_config)
+            writers[split_name].write(doc)
+            split_stats = stats[split_name]
+            split_stats["count"] += 1
+            split_stats["languages"][doc.get("language", "unknown")] += 1
+            split_stats["total_length"] += len(doc.get("text", ""))
+    finally:
+        files = {name: writer.close() for name, writer in writers.items()}
+
+    for name, writer in writers.items():
+        logger.info("Exported %s items for %s", writer.count, name)
+    _save_stats(stats, config, append)
+    return files
+
+
+def _export_raw_documents(
+    documents: Iterable[Dict], config: Dict, suffix: str, logger, append: bool = False
+) -> int:
     output_config = config.get("output", {})
     output_dir = Path(output_config.get("output_dir", "./output/clean_text")) / "raw"
-    formats = output_config.get("formats", ["jsonl"])
-    compression = output_config.get("compression")
-    output_dir.mkdir(parents=True, exist_ok=True)
-    if "jsonl" in formats:
-        export_jsonl(documents, str(output_dir / f"{suffix}.jsonl"), compression)
-    if "parquet" in formats:
-        export_parquet(documents, str(output_dir / f"{suffix}.parquet"), compression)
-    logger.info("Exported %s raw documents to %s", len(documents), output_dir)
+    writer = _sharded_writer(config, output_dir, suffix, append)
+    try:
+        for doc in documents:
+            writer.write(doc)
+    finally:
+        writer.close()
+    logger.info("Exported %s raw documents to %s", writer.count, output_dir)
+    return writer.count
+
+
+def _load_stats(stats_path: Path) -> Dict[str, Any]:
+    try:
+        summary = json.loads(stats_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return summary if isinstance(summary, dict) else {}
 
 
-def _save_stats(splits: Dict[str, List[Dict]], config: Dict) -> None:
+def _save_stats(stats: Dict[str, Dict], config: Dict, append: bool = False) -> None:
     metadata = config.get("metadata", {})
     if not metadata.get("save_statistics", True):
         return
     stats_dir = Path(metadata.get("statistics_dir", "./stats/clean_text"))
     stats_dir.mkdir(parents=True, exist_ok=True)
 
-    for split_name, items in splits.items():
-        languages: Dict[str, int] = {}
-        lengths = [len(item.get("text", "")) for item in items]
-        for item in items:
-            lang = item.get("language", "unknown")
-            languages[lang] = languages.get(lang, 0) + 1
-        average_length = sum(lengths) / len(lengths) if lengths else 0
-        stats = {
-            "count": len(items),
-            "languages": languages,
-            "average_length": average_length,
-        }
+    for split_name, split_stats in stats.items():
         stats_path = stats_dir / f"{split_name}_stats.json"
-        stats_path.write_text(json.dumps(stats, ensure_ascii=False, indent=2), encoding="utf-8")
+        count = split_stats["count"]
+        languages = Counter(split_stats["languages"])
+        total_length = split_stats["total_length"]
+        if append:
+            # Appended shards extend the split, so earlier runs' counts stay in the totals.
+            previous = _load_stats(stats_path)
+            previous_count = int(previous.get("count", 0))
+            count += previous_count
+            languages.update(previous.get("languages", {}))
+            total_length += previous.get("average_length", 0) * previous_count
+        summary = {
+            "count": count,
+            "languages": dict(languages),
+            "average_length": total_length / count if count else 0,
+        }
+        stats_path.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def _upload_splits(
+    files: Dict[str, Dict[str, List[Path]]], config: Dict, no_upload: bool, logger
+) -> None:
+    output_config = config.get("output", {})
+    hf_repo = output_config.get("hf_repo")
+    if not hf_repo:
+        return
+    if no_upload:
+        logger.info("Skipping Hugging Face upload (flagged).")
+        return
+    upload_format = "parquet" if "parquet" in output_config.get("formats", ["jsonl"]) else "jsonl"
+    data_files = {
+        split_name: files.get(split_name, {}).get(upload_format, [])
+        for split_name in ("train", "validation")
+    }
+    upload_dataset_files(data_files, hf_repo, output_config.get("hf_private", False), logger)
 
 
 @app.command()
@@ -327,6 +641,17 @@ def run(
         "--merge-inputs",
         help="Input files to merge (repeatable).",
     ),
+    full: bool = typer.Option(
+        False, "--full", help="Ignore the crawl frontier and reprocess every discovered URL."
+    ),
+    from_warc: Optional[List[Path]] = typer.Option(
+        None,
+        "--from-warc",
+        help="Re-extract news documents from WARC files or directories instead of crawling.",
+    ),
+    workers: int = typer.Option(
+        1, "--workers", min=1, help="Processes for cleaning, quality and language checks."
+    ),
 ) -> None:
     config = load_config(config_path)
     logger = setup_logging(
@@ -339,94 +664,115 @@ def run(
         raise typer.BadParameter("--merge-inputs cannot be used with --no-split")
     if merge_inputs and dry_run:
         raise typer.BadParameter("--merge-inputs cannot be used with --dry-run")
+    if from_warc and (merge_inputs or dry_run):
+        raise typer.BadParameter("--from-warc cannot be used with --merge-inputs or --dry-run")
 
     sources = load_sources(str(sources_path))
     sources = filter_sources(sources, source)
+    _validate_selectors(sources)
+    _validate_cleaning(config)
 
     if not sources and not merge_inputs:
         logger.warning("No sources enabled or matched the filter.")
         return
 
-    fetcher = _build_fetcher(config, logger)
-
     if merge_inputs:
-        documents = _load_merge_inputs(merge_inputs, logger)
-        logger.info("Loaded %s documents from merge inputs", len(documents))
-        deduped = deduplicate_documents(documents, config.get("deduplication", {}), logger)
-        deduped = _assign_ids(deduped)
-        splits = split_dataset(deduped, config.get("splits", {}))
-        _export_splits(splits, config, logger)
-        _save_stats(splits, config)
-
-        output_config = config.get("output", {})
-        hf_repo = output_config.get("hf_repo")
-        if hf_repo and not no_upload:
-            hf_splits = {
-                "train": splits.get("train", []),
-                "validation": splits.get("validation", []),
-            }
-            upload_dataset(hf_splits, hf_repo, output_config.get("hf_private", False), logger)
-        elif hf_repo and no_upload:
-            logger.info("Skipping Hugging Face upload (flagged).")
+        output_dir = Path(config.get("output", {}).get("output_dir", "./output/clean_text"))
+        input_files = _merge_input_files(merge_inputs, output_dir)
+        documents = _iter_merge_inputs(input_files, logger)
+        deduped = iter_deduplicated(documents, config.get("deduplication", {}), logger)
+        merged = _export_splits(_assign_ids(deduped), config, logger)
+        _upload_splits(merged, config, no_upload, logger)
         return
 
+    fetcher = _build_fetcher(config, logger)
+    wiki_sources = [src for src in sources if src.get("type") == "wiki"]
+    news_sources = [src for src in sources if src.get("type") != "wiki"]
+
     if dry_run:
-        for src in sources:
-            if src.get("type") == "wiki":
-                logger.info("Wikipedia dump configured for %s", src.get("name"))
-                continue
+        for src in wiki_sources:
+            logger.info("Wikipedia dump configured for %s", src.get("name"))
+        for src, discovered in _discover_sources(news_sources, fetcher, since_date):
             if src.get("rss_use_content"):
-                entries = collect_rss_entries(src, fetcher, since_date)
-                logger.info("Dry run: %s RSS entries for %s", len(entries), src.get("name"))
+                logger.info("Dry run: %s RSS entries for %s", len(discovered), src.get("name"))
             else:
-                urls = discover_urls(src, fetcher, since_date)
-                logger.info("Dry run: %s URLs for %s", len(urls), src.get("name"))
+                logger.info("Dry run: %s URLs for %s", len(discovered), src.get("name"))
+        fetcher.log_stats()
+        fetcher.close()
         return
 
-    raw_documents: List[Dict] = []
-    default_rate_limit = config.get("collection", {}).get("default_rate_limit", 1)
+    frontier = _open_frontier(config, full or bool(from_warc))
+    counts: Counter = Counter()
+    files: Dict[str, Dict[str, List[Path]]] = {}
+    raw_documents: Optional[Generator[Dict, None, None]] = None
+    try:
+        raw_documents = _counted(
+            _iter_collected_documents(
+                wiki_sources,
+                news_sources,
+                fetcher,
+                since_date,
+                limit,
+                from_warc,
+                config,
+                logger,
+                frontier,
+            ),
+            counts,
+            "collected",
+        )
+        on_reject = partial(_defer_in_frontier, frontier) if frontier is not None else None
+        processed = _counted(
+            _apply_processing_pipeline(
+                raw_documents,
+                config,
+                logger,
+                assign_ids=not no_split,
+                on_reject=on_reject,
+                workers=workers,
+            ),
+            counts,
+            "processed",
+        )
 
-    for src in sources:
-        if src.get("type") == "wiki":
-            raw_documents.extend(_collect_wikipedia_documents(src, fetcher, limit, logger))
+        if no_split:
+            # With the frontier on, earlier runs' output is kept and this run's shards appended.
+            _export_raw_documents(
+                _track_emitted(processed, frontier),
+                config,
+                output_suffix,
+                logger,
+                append=frontier is not None,
+            )
         else:
-            raw_documents.extend(
-                _collect_news_documents(
-                    src,
-                    fetcher,
-                    since_date,
-                    limit,
-                    default_rate_limit,
-                    logger,
-                )
+            on_duplicate = (
+                partial(_reject_in_frontier, frontier, reason="duplicate")
+                if frontier is not None
+                else None
             )
-
-    logger.info("Collected %s raw documents", len(raw_documents))
-
-    processed = _apply_processing_pipeline(raw_documents, config, logger, assign_ids=not no_split)
-    logger.info("Processed %s documents after cleaning", len(processed))
-
-    if no_split:
-        _export_raw_documents(processed, config, output_suffix, logger)
-        return
-
-    deduped = deduplicate_documents(processed, config.get("deduplication", {}), logger)
-    logger.info("Deduplicated to %s documents", len(deduped))
-
-    splits = split_dataset(deduped, config.get("splits", {}))
-    _export_splits(splits, config, logger)
-    _save_stats(splits, config)
-
-    output_config = config.get("output", {})
-    hf_repo = output_config.get("hf_repo")
-    if hf_repo and not no_upload:
-        hf_splits = {
-            "train": splits.get("train", []),
-            "validation": splits.get("validation", []),
-        }
-        upload_dataset(hf_splits, hf_repo, output_config.get("hf_private", False), logger)
-    elif hf_repo and no_upload:
-        logger.info("Skipping Hugging Face upload (flagged).")
+            deduped = _counted(
+                iter_deduplicated(
+                    processed, config.get("deduplication", {}), logger, on_duplicate
+                ),
+                counts,
+                "deduplicated",
+            )
+            files = _export_splits(
+                _track_emitted(deduped, frontier), config, logger, append=frontier is not None
+            )
+    finally:
+        # Stop fetch and extraction workers before their cache and frontier are closed.
+        if raw_documents is not None:
+            raw_documents.close()
+        fetcher.log_stats()
+        fetcher.close()
+        _close_frontier(frontier, logger)
+
+    logger.info("Collected %s raw documents", counts["collected"])
+    logger.info("Processed %s documents after cleaning", counts["processed"])
+    if not no_split:
+        logger.info("Deduplicated to %s documents", counts["deduplicated"])
+        _upload_splits(files, config, no_upload, logger)
 
 
 if __name__ == "__main__":
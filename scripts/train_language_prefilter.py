@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import gzip
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import typer
+
+from processing.language_check import DEFAULT_MAX_CHARS, DEFAULT_WINDOWS, prediction_text
+from processing.language_prefilter import (
+    NUM_BUCKETS,
+    calibrate_prefilter,
+    feature_ids,
+    fit_prefilter,
+    prefilter_language,
+    save_prefilter,
+)
+from utils.hashing import sha256_digest64
+from utils.logging import setup_logging
+
+
+app = typer.Typer(help="Train the sr/bs/hr language prefilter from clean-text output.")
+
+
+def _input_files(path: Path) -> List[Path]:
+    if not path.is_dir():
+        return [path]
+    return sorted(
+        file_path
+        for pattern in ("*.jsonl.gz", "*.jsonl", "*.parquet")
+        for file_path in path.rglob(pattern)
+    )
+
+
+def _iter_documents(path: Path) -> Iterator[Dict]:
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches():
+            yield from batch.to_pylist()
+        return
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+@app.command()
+def main(
+    inputs: List[Path] = typer.Argument(..., help="Clean-text output files or directories."),
+    output: Path = typer.Option(
+        Path("models/bcs_prefilter.npz"), "--output", help="Where to write the model."
+    ),
+    languages: str = typer.Option("sr,bs,hr", "--languages", help="Comma-separated labels."),
+    max_docs: Optional[int] = typer.Option(
+        None, "--max-docs", help="Training documents per language."
+    ),
+    holdout: float = typer.Option(0.1, "--holdout", help="Share held out for calibration."),
+    max_chars: int = typer.Option(DEFAULT_MAX_CHARS, "--max-chars", help="Characters per doc."),
+    alpha: float = typer.Option(0.5, "--alpha", help="Additive smoothing."),
+    min_confidence: float = typer.Option(
+        0.98, "--min-confidence", help="Report coverage at this prefilter_min_confidence."
+    ),
+) -> None:
+    logger = setup_logging()
+    labels = [label.strip() for label in languages.split(",") if label.strip()]
+    counts = {label: np.zeros(NUM_BUCKETS, dtype=np.float64) for label in labels}
+    trained = {label: 0 for label in labels}
+    held_out: List[Tuple[str, str]] = []
+
+    for path in inputs:
+        if not path.exists():
+            raise typer.BadParameter(f"Missing input: {path}")
+        for file_path in _input_files(path):
+            for document in _iter_documents(file_path):
+                label = document.get("language")
+                text = document.get("text") or ""
+                if label not in counts or not text:
+                    continue
+                text = prediction_text(text, max_chars, DEFAULT_WINDOWS)
+                key = document.get("url") or text
+                # Hash-based holdout keeps the same documents out of training on every run.
+                if sha256_digest64(key) % 10_000 < holdout * 10_000:
+                    held_out.append((label, text))
+                elif max_docs is None or trained[label] < max_docs:
+                    counts[label] += np.bincount(feature_ids(text), minlength=NUM_BUCKETS)
+                    trained[label] += 1
+
+    logger.info("Training documents per language: %s", trained)
+    missing = [label for label, count in trained.items() if not count]
+    if missing:
+        raise typer.BadParameter(f"No training documents for: {', '.join(missing)}")
+    if not held_out:
+        raise typer.BadParameter("No held-out documents; raise --holdout or add input")
+
+    model = calibrate_prefilter(fit_prefilter(counts, alpha=alpha), held_out)
+    save_prefilter(model, output)
+    logger.info("Saved prefilter to %s (%s held-out documents)", output, len(held_out))
+
+    # With a model every document gets a prediction; the fallback only satisfies the Optional.
+    predictions = [prefilter_language(text, model) or ("", 0.0) for _, text in held_out]
+    correct = sum(label == predicted for (label, _), (predicted, _) in zip(held_out, predictions))
+    settled = [
+        label == predicted
+        for (label, _), (predicted, confidence) in zip(held_out, predictions)
+        if confidence >= min_confidence
+    ]
+    logger.info("Held-out accuracy: %.2f%%", 100 * correct / len(held_out))
+    logger.info(
+        "At confidence >= %.2f: %.1f%% settled without fastText, %.2f%% of those correct",
+        min_confidence,
+        100 * len(settled) / len(held_out),
+        100 * sum(settled) / len(settled) if settled else 0.0,
+    )
+
+
+if __name__ == "__main__":
+    app()
@@ -2,13 +2,10 @@ from __future__ import annotations
 
 from pathlib import Path
 from typing import Dict, List, Optional
-import gzip
-import json
 
-import pandas as pd
 import typer
 
-from export.hf_upload import upload_dataset
+from export.hf_upload import upload_dataset_files
 from utils.config import load_config
 from utils.logging import setup_logging
 
@@ -16,48 +13,35 @@ from utils.logging import setup_logging
 app = typer.Typer(help="Upload existing dataset splits to Hugging Face.")
 
 
-def _load_documents(path: Path) -> List[Dict]:
-    if path.suffix == ".parquet":
-        frame = pd.read_parquet(path)
-        return frame.to_dict(orient="records")
-    if path.suffix == ".gz":
-        opener = gzip.open
-    elif path.suffix == ".jsonl":
-        opener = open
-    else:
+def _check_format(path: Path) -> Path:
+    if path.suffix not in (".parquet", ".gz", ".jsonl"):
         raise typer.BadParameter(f"Unsupported input format: {path}")
+    return path
 
-    documents: List[Dict] = []
-    with opener(path, "rt", encoding="utf-8") as handle:
-        for line in handle:
-            line = line.strip()
-            if not line:
-                continue
-            documents.append(json.loads(line))
-    return documents
-
-
-def _resolve_split_file(input_dir: Path, split_name: str) -> Optional[Path]:
-    candidates = [
-        input_dir / f"{split_name}.jsonl.gz",
-        input_dir / f"{split_name}.jsonl",
-        input_dir / f"{split_name}.parquet",
-    ]
-    for candidate in candidates:
+
+def _resolve_split_files(input_dir: Path, split_name: str) -> List[Path]:
+    for suffix in (".jsonl.gz", ".jsonl", ".parquet"):
+        shards = sorted(input_dir.glob(f"{split_name}-[0-9][0-9][0-9][0-9][0-9]{suffix}"))
+        if shards:
+            return shards
+        candidate = input_dir / f"{split_name}{suffix}"
         if candidate.exists():
-            return candidate
-    return None
+            return [candidate]
+    return []
 
 
-def _load_splits(input_dir: Path, overrides: Dict[str, Optional[Path]], logger) -> Dict[str, List[Dict]]:
-    splits: Dict[str, List[Dict]] = {}
+def _find_splits(
+    input_dir: Path, overrides: Dict[str, Optional[Path]], logger
+) -> Dict[str, List[Path]]:
+    splits: Dict[str, List[Path]] = {}
     for split_name in ("train", "validation", "test"):
         path = overrides.get(split_name)
-        if not path and input_dir:
-            path = _resolve_split_file(input_dir, split_name)
-        if path:
-            splits[split_name] = _load_documents(path)
-            logger.info("Loaded %s items for %s from %s", len(splits[split_name]), split_name, path)
+        files = [_check_format(path)] if path else []
+        if not files and input_dir:
+            files = _resolve_split_files(input_dir, split_name)
+        if files:
+            splits[split_name] = files
+            logger.info("Found %s file(s) for %s in %s", len(files), split_name, files[0].parent)
     if not splits:
         raise typer.BadParameter("No split files found. Provide --input-dir or --train/--validation/--test.")
     return splits
@@ -99,12 +83,12 @@ def run(
         if output_dir:
             resolved_input_dir = (config_path.parent / output_dir).resolve()
 
-    splits = _load_splits(
+    splits = _find_splits(
         resolved_input_dir if resolved_input_dir else Path("."),
         {"train": train_path, "validation": validation_path, "test": test_path},
         logger,
     )
-    upload_dataset(splits, repo_name, repo_private, logger)
+    upload_dataset_files(splits, repo_name, repo_private, logger)
 
 
 if __name__ == "__main__":
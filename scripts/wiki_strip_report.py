@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+import statistics
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import mwparserfromhell
+import typer
+
+from scraping.sources.wikipedia import iter_raw_pages
+from scraping.sources.wikitext import is_disambiguation, strip_wikitext
+from utils.logging import setup_logging
+
+
+app = typer.Typer(help="Compare the fast wikitext stripper against mwparserfromhell.")
+
+
+def _token_scores(reference: str, candidate: str) -> Dict[str, float]:
+    expected = Counter(reference.split())
+    produced = Counter(candidate.split())
+    overlap = sum((expected & produced).values())
+    precision = overlap / sum(produced.values()) if produced else 1.0
+    recall = overlap / sum(expected.values()) if expected else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"precision": precision, "recall": recall, "f1": f1}
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "mean": round(statistics.fmean(ordered), 4),
+        "median": round(statistics.median(ordered), 4),
+        "p10": round(ordered[len(ordered) // 10], 4),
+    }
+
+
+@app.command()
+def main(
+    dump_path: Path = typer.Argument(..., help="Wikipedia pages-articles(-multistream) .xml.bz2 dump."),
+    sample: int = typer.Option(2000, "--sample", help="Number of articles to compare."),
+    min_chars: int = typer.Option(500, "--min-chars", help="Skip pages with shorter wikitext."),
+    worst: int = typer.Option(10, "--worst", help="Number of lowest-F1 pages to list."),
+    output: Optional[Path] = typer.Option(None, "--output", help="Write the report as JSON."),
+) -> None:
+    logger = setup_logging()
+    rows: List[Dict] = []
+    reference_seconds = 0.0
+    fast_seconds = 0.0
+
+    for title, wikitext in iter_raw_pages(dump_path):
+        if len(wikitext) < min_chars or is_disambiguation(wikitext):
+            continue
+        started = time.perf_counter()
+        reference = mwparserfromhell.parse(wikitext).strip_code()
+        reference_seconds += time.perf_counter() - started
+        started = time.perf_counter()
+        candidate = strip_wikitext(wikitext)
+        fast_seconds += time.perf_counter() - started
+        rows.append({"title": title, **_token_scores(reference, candidate)})
+        if len(rows) >= sample:
+            break
+
+    if not rows:
+        logger.warning("No articles found in %s", dump_path)
+        return
+
+    report = {
+        "dump": dump_path.name,
+        "pages": len(rows),
+        "precision": _summary([row["precision"] for row in rows]),
+        "recall": _summary([row["recall"] for row in rows]),
+        "f1": _summary([row["f1"] for row in rows]),
+        "f1_at_least_0_9": round(sum(row["f1"] >= 0.9 for row in rows) / len(rows), 4),
+        "mwparserfromhell_seconds": round(reference_seconds, 3),
+        "fast_seconds": round(fast_seconds, 3),
+        "speedup": round(reference_seconds / fast_seconds, 1) if fast_seconds else None,
+        "worst": [
+            {"title": row["title"], "f1": round(row["f1"], 4)}
+            for row in sorted(rows, key=lambda row: row["f1"])[:worst]
+        ],
+    }
+
+    logger.info("Compared %s articles from %s", report["pages"], report["dump"])
+    for metric in ("precision", "recall", "f1"):
+        logger.info("Token %s: %s", metric, report[metric])
+    logger.info("Pages with F1 >= 0.9: %.1f%%", 100 * report["f1_at_least_0_9"])
+    logger.info(
+        "Time: mwparserfromhell %.2fs, fast %.2fs (%.1fx)",
+        reference_seconds,
+        fast_seconds,
+        report["speedup"] or 0,
+    )
+    for row in report["worst"]:
+        logger.info("  low F1 %.3f: %s", row["f1"], row["title"])
+
+    if output:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,39 @@
+import pytest
+
+from scraping.cache import CacheEntry, FileCache, SQLiteCache, classify_url
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("https://klix.ba/robots.txt", "robots"),
+        ("https://klix.ba/sitemap.xml", "sitemap"),
+        ("https://klix.ba/sitemap_index.xml", "sitemap"),
+        ("https://klix.ba/news-sitemap-2024.xml.gz", "sitemap"),
+        ("https://klix.ba/rss", "feed"),
+        ("https://klix.ba/vijesti/feed/", "feed"),
+        ("https://klix.ba/vijesti.rss", "feed"),
+        ("https://klix.ba/vijesti/atomska-elektrana", "article"),
+        ("https://klix.ba/sitemap-vijesti/clanak", "article"),
+        ("https://klix.ba/rssfeedovi-su-mrtvi", "article"),
+    ],
+)
+def test_classify_url(url, expected):
+    assert classify_url(url) == expected
+
+
+@pytest.mark.parametrize("backend", ["files", "sqlite"])
+def test_cache_keeps_raw_bytes(tmp_path, backend):
+    cache = (
+        FileCache(tmp_path / "files")
+        if backend == "files"
+        else SQLiteCache(tmp_path / "cache.sqlite3")
+    )
+    body = "Čitaj više".encode("cp1250")
+    cache.put(CacheEntry(url="https://klix.ba/a", content=body, encoding="cp1250"))
+    entry = cache.get("https://klix.ba/a")
+    assert entry is not None
+    assert entry.content == body
+    assert entry.text == "Čitaj više"
+    assert cache.stats().entries == 1
+    cache.close()
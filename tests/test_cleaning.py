@@ -0,0 +1,70 @@
+import random
+import re
+
+import pytest
+
+from processing.cleaning import clean_document, compile_cleaner
+from utils.text_utils import anonymize_text
+
+
+WORDS = "pročitajte više pratite nas komentari autor foto izvor video galerija oglas".split()
+
+
+def _sequential_clean(text, patterns):
+    # Reference behaviour: every exclude pattern applied on its own, in order.
+    for pattern in sorted(patterns, key=lambda pattern: not pattern.startswith("line:")):
+        if pattern.startswith("line:"):
+            regex = rf"(?m:^[ \t]*(?:{pattern[5:]})[ \t]*(?:\n|$))"
+        elif pattern.startswith("regex:"):
+            regex = pattern[6:]
+        else:
+            regex = re.escape(pattern)
+        text = re.sub(regex, "", text)
+    return anonymize_text(text).strip()
+
+
+def test_literal_trie_matches_sequential_replacement():
+    rng = random.Random(7)
+    literals = sorted({" ".join(rng.sample(WORDS, 3)) + f" #{index};" for index in range(200)})
+    body = "Vlada je usvojila budžet za narednu godinu. "
+    text = "".join(body + rng.choice(literals) + "\n" for _ in range(300))
+    config = {"exclude_patterns": literals}
+    assert clean_document(text, config) == _sequential_clean(text, literals)
+
+
+def test_longest_literal_wins_over_its_prefix():
+    config = {"exclude_patterns": ["Foto", "Foto: Reuters"]}
+    assert clean_document("Naslov Foto: Reuters tekst", config) == "Naslov  tekst"
+
+
+def test_mixed_patterns_match_sequential_results():
+    patterns = [
+        "Pročitajte više",
+        "line:Komentari \\(\\d+\\)",
+        "regex:\\[oglas\\]",
+        "Pratite nas na",
+    ]
+    text = (
+        "Prvi pasus. Pročitajte više\nKomentari (12)\nDrugi [oglas] pasus.\n"
+        "Pratite nas na mrežama.\n  Komentari (3)  \nKraj."
+    )
+    assert clean_document(text, {"exclude_patterns": patterns}) == _sequential_clean(
+        text, patterns
+    )
+
+
+def test_patterns_with_groups_keep_their_own_numbering():
+    patterns = [
+        "regex:(?P<tag>ad)-(?P=tag)",
+        "regex:(x)\\1",
+        "regex:(?P<tag>promo)",
+        "regex:(y)(z)\\2",
+    ]
+    text = "keep ad-ad xx promo yzz x"
+    cleaner = compile_cleaner({"exclude_patterns": patterns})
+    assert cleaner.clean(text) == _sequential_clean(text, patterns) == "keep     x"
+
+
+def test_invalid_pattern_raises_value_error():
+    with pytest.raises(ValueError, match="invalid exclude pattern"):
+        compile_cleaner({"exclude_patterns": ["regex:(unclosed"]})
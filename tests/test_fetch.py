@@ -0,0 +1,79 @@
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+import pytest
+
+from scraping.cache import CacheEntry
+from scraping.fetch import Fetcher, FetchConfig
+
+
+ROBOTS = b"User-agent: *\nDisallow: /private\n"
+
+
+@pytest.fixture
+def server():
+    state: Dict[str, Any] = {"robots_status": 200, "robots_hits": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/robots.txt":
+                state["robots_hits"] += 1
+                status = state["robots_status"]
+                body = ROBOTS if status == 200 else b""
+            else:
+                status, body = 200, b"ok"
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    state["base"] = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield state
+    httpd.shutdown()
+
+
+def _fetcher(tmp_path):
+    config = FetchConfig(
+        user_agent="balkan-nlp-test",
+        timeout=2,
+        max_retries=1,
+        respect_robots_txt=True,
+        cache_enabled=True,
+        cache_dir=tmp_path,
+        rate_limit=100.0,
+    )
+    return Fetcher(config, logging.getLogger("balkan_nlp"))
+
+
+@pytest.mark.parametrize("status", [429, 500, 503])
+def test_unavailable_robots_disallows_until_it_recovers(tmp_path, server, status):
+    fetcher = _fetcher(tmp_path)
+    server["robots_status"] = status
+    assert fetcher.fetch(server["base"] + "/a") is None
+    assert fetcher.cache.get(server["base"] + "/robots.txt") is None
+
+    server["robots_status"] = 200
+    assert fetcher.fetch(server["base"] + "/a") == "ok"
+    assert fetcher.fetch(server["base"] + "/private/b") is None
+    assert server["robots_hits"] == 2
+    fetcher.close()
+
+
+def test_unreachable_robots_falls_back_to_stale_copy(tmp_path):
+    fetcher = _fetcher(tmp_path)
+    base = "http://127.0.0.1:1"
+    fetcher.cache.put(
+        CacheEntry(url=base + "/robots.txt", content=ROBOTS, fetched_at=0.0, expires_at=1.0)
+    )
+    assert fetcher._allowed_by_robots(base + "/a")
+    assert not fetcher._allowed_by_robots(base + "/private/b")
+    assert not fetcher._allowed_by_robots("http://127.0.0.1:2/a")
+    fetcher.close()
@@ -0,0 +1,104 @@
+import logging
+
+import numpy as np
+import pytest
+
+from processing import language_prefilter
+from processing.language_check import validate_languages
+from processing.language_prefilter import (
+    calibrate_prefilter,
+    count_features,
+    fit_prefilter,
+    load_prefilter,
+    prefilter_language,
+    save_prefilter,
+)
+
+
+LOGGER = logging.getLogger("balkan_nlp")
+PREFILTER_ONLY = {"use_prefilter": True, "use_fasttext_validation": False}
+
+SR_CYRILLIC = "Влада Србије је саопштила да ће нови закон бити усвојен следеће недеље."
+SR_LATIN = "Gde je bilo vreme kad su deca posle škole uvek igrala fudbal pored reke."
+HR_LATIN = "Tko zna koliko tisuća ljudi svaki tjedan dolazi na nogomet tijekom siječnja."
+BS_LATIN = "Historija mahale je lahko ispričana uz kahvu, a hljeb se kupovao u sahat."
+RU_CYRILLIC = "Правительство объявило, что новый закон будет принят на следующей неделе."
+MK_CYRILLIC = "Владата соопшти дека новиот закон ќе биде усвоен следната недела."
+PLAIN_CYRILLIC = "Вода и хлеб су на столу, а деца су у школи."
+NEUTRAL = "Utakmica je završena neriješeno, a navijači su otišli kući."
+
+TRAINING = {
+    "sr": [SR_LATIN, "Ovde je vreme lepo, a deca piju mleko svake nedelje.", "Pesma o reci."],
+    "hr": [HR_LATIN, "Sveučilište i kazalište rade točno po sustavu.", "Obitelj i kruh."],
+    "bs": [BS_LATIN, "Historijski sahat na mahali je lahko popraviti.", "Kahva i hljeb."],
+}
+
+
+def test_serbian_cyrillic_letters_confirm_serbian():
+    assert prefilter_language(SR_CYRILLIC, None) == ("sr", 1.0)
+
+
+@pytest.mark.parametrize("text", [RU_CYRILLIC, MK_CYRILLIC, PLAIN_CYRILLIC])
+def test_other_cyrillic_is_left_to_fasttext(text):
+    assert prefilter_language(text, None) is None
+
+
+@pytest.mark.parametrize(
+    "text, expected", [(SR_LATIN, "sr"), (HR_LATIN, "hr"), (BS_LATIN, "bs")]
+)
+def test_markers_identify_latin_samples(text, expected):
+    assert prefilter_language(text, None) == (expected, 1.0)
+
+
+def test_markers_abstain_without_enough_evidence():
+    assert prefilter_language(NEUTRAL, None) is None
+
+
+@pytest.mark.parametrize(
+    "text, language", [(SR_CYRILLIC, "sr"), (SR_LATIN, "sr"), (HR_LATIN, "hr"), (BS_LATIN, "bs")]
+)
+def test_prefilter_confirms_matching_language(text, language):
+    [check] = validate_languages([{"text": text, "language": language}], PREFILTER_ONLY, LOGGER)
+    assert check.passed
+    assert check.method == "prefilter"
+    assert check.predicted == language
+
+
+@pytest.mark.parametrize(
+    "text, language", [(SR_CYRILLIC, "hr"), (SR_LATIN, "bs"), (HR_LATIN, "sr"), (BS_LATIN, "hr")]
+)
+def test_prefilter_defers_disagreements(text, language):
+    # Without fastText a deferred document is kept rather than rejected by the prefilter.
+    [check] = validate_languages([{"text": text, "language": language}], PREFILTER_ONLY, LOGGER)
+    assert check.passed
+    assert check.method is None
+
+
+def test_trained_model_round_trip(tmp_path):
+    counts = {label: count_features(texts) for label, texts in TRAINING.items()}
+    held_out = [(label, texts[0]) for label, texts in TRAINING.items()]
+    model = calibrate_prefilter(fit_prefilter(counts), held_out)
+    path = tmp_path / "prefilter.npz"
+    save_prefilter(model, path)
+
+    loaded = load_prefilter(str(path))
+    assert loaded.labels == ("bs", "hr", "sr")
+    np.testing.assert_array_equal(loaded.log_probs, model.log_probs)
+    for label, text in held_out:
+        assert loaded.predict(text)[0] == label
+
+
+def test_load_failures_are_remembered(tmp_path, monkeypatch):
+    path = str(tmp_path / "missing.npz")
+    reads = []
+    original = language_prefilter._read_prefilter
+
+    def counting_read(model_path):
+        reads.append(model_path)
+        return original(model_path)
+
+    monkeypatch.setattr(language_prefilter, "_read_prefilter", counting_read)
+    for _ in range(3):
+        with pytest.raises((OSError, ValueError)):
+            load_prefilter(path)
+    assert reads == [path]
@@ -0,0 +1,42 @@
+import gzip
+from datetime import datetime
+
+from scraping.sources.common import _parse_sitemap
+
+
+IMAGE_SITEMAP = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+        xmlns:image="http://www.google.com/schemas/sitemap-image/1.1"
+        xmlns:video="http://www.google.com/schemas/sitemap-video/1.1">
+  <url>
+    <image:image><image:loc>https://klix.ba/slika.jpg</image:loc></image:image>
+    <loc>https://klix.ba/vijesti/a</loc>
+    <lastmod>2025-03-01</lastmod>
+  </url>
+  <url>
+    <video:video><video:content_loc>https://klix.ba/video.mp4</video:content_loc></video:video>
+    <loc> https://klix.ba/vijesti/b </loc>
+    <lastmod>2019-03-01</lastmod>
+  </url>
+</urlset>
+"""
+
+SITEMAP_INDEX = b"""<sitemapindex>
+  <sitemap><loc>https://klix.ba/sitemap-1.xml.gz</loc></sitemap>
+</sitemapindex>
+"""
+
+
+def test_page_loc_wins_over_image_and_video_locs():
+    urls, children = _parse_sitemap(IMAGE_SITEMAP, None)
+    assert urls == ["https://klix.ba/vijesti/a", "https://klix.ba/vijesti/b"]
+    assert children == []
+
+
+def test_lastmod_filter_and_gzip():
+    urls, _ = _parse_sitemap(gzip.compress(IMAGE_SITEMAP), datetime(2024, 1, 1))
+    assert urls == ["https://klix.ba/vijesti/a"]
+
+
+def test_sitemap_index_without_namespace():
+    assert _parse_sitemap(SITEMAP_INDEX, None) == ([], ["https://klix.ba/sitemap-1.xml.gz"])
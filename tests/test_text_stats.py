@@ -0,0 +1,48 @@
+import string
+
+import pytest
+
+from utils.text_utils import TextStats, text_stats, text_stats_batch
+
+
+SAMPLES = [
+    "",
+    " ",
+    "Sarajevo, 12. mart 2024. — Vijeće je usvojilo 3 odluke!",
+    "Ђоковић је освојио 24. гренд слем титулу.\n\nНови ред\tса табом",
+    "  leading and trailing  ",
+    "emoji 🎉 and math 𝔘𝔫𝔦𝔠𝔬𝔡𝔢 ٣٤ ²³ ½",
+    "nbsp zero​width soft­hyphen",
+    "(email@example.com) #hash $100 50% [x]",
+]
+
+
+def _reference_stats(text: str) -> TextStats:
+    return TextStats(
+        length=len(text),
+        words=len(text.split()),
+        digits=sum(char.isdigit() for char in text),
+        specials=sum(not char.isalnum() and not char.isspace() for char in text),
+        punctuation=sum(char in string.punctuation for char in text),
+    )
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_text_stats_matches_reference(text):
+    assert text_stats(text) == _reference_stats(text)
+
+
+def test_text_stats_batch_matches_single_documents():
+    # Words must not merge across document boundaries in the concatenated batch.
+    texts = SAMPLES + ["end", "start", "", "x"]
+    assert text_stats_batch(texts) == [_reference_stats(text) for text in texts]
+
+
+def test_text_stats_batch_mixes_short_and_long_documents():
+    long_text = SAMPLES[2] * 100
+    texts = [SAMPLES[3], long_text, "", SAMPLES[5], long_text[:-1]]
+    assert text_stats_batch(texts) == [_reference_stats(text) for text in texts]
+
+
+def test_text_stats_batch_of_empty_documents():
+    assert text_stats_batch(["", ""]) == [TextStats(0, 0, 0, 0, 0)] * 2
@@ -0,0 +1,37 @@
+from scraping.cache import CacheEntry
+from scraping.warc import WarcWriter, iter_warc_records
+
+
+def test_warc_round_trip(tmp_path):
+    writer = WarcWriter(tmp_path, max_bytes=1)
+    entries = [
+        CacheEntry(
+            url="https://example.com/članak",
+            content="Čitaj više o ćevapima.".encode("cp1250"),
+            encoding="cp1250",
+            headers={"Content-Type": "text/html; charset=cp1250", "Content-Encoding": "gzip"},
+        ),
+        CacheEntry(
+            url="https://example.com/robots.txt",
+            content=b"User-agent: *\r\n\r\nDisallow: /private\r\n",
+            status=404,
+            headers={"Content-Type": "text/plain"},
+        ),
+    ]
+    for entry in entries:
+        writer.write(entry)
+    writer.close()
+
+    records = list(iter_warc_records([tmp_path]))
+    assert len(list(tmp_path.glob("*.warc.gz"))) == 2
+    assert len(list(tmp_path.glob("*.cdx"))) == 2
+    assert [record.url for record in sorted(records, key=lambda r: r.url)] == sorted(
+        entry.url for entry in entries
+    )
+    by_url = {record.url: record for record in records}
+    for entry in entries:
+        record = by_url[entry.url]
+        assert record.content == entry.content
+        assert record.status == entry.status
+        assert "Content-Encoding" not in record.headers
+    assert by_url["https://example.com/članak"].text == "Čitaj više o ćevapima."
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+import pytest
+
+from scraping.sources.wikipedia import WikipediaDumpConfig, _download_file
+
+
+LOGGER = logging.getLogger("balkan_nlp")
+FILE_NAME = "bswiki-latest-pages-articles.xml.bz2"
+BODY = bytes(range(256)) * 64
+ETAG = '"20250601"'
+
+
+@pytest.fixture
+def server():
+    state: Dict[str, Any] = {"ignore_if_range": False, "statuses": []}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requested = self.headers.get("Range")
+            current = self.headers.get("If-Range") == ETAG or state["ignore_if_range"]
+            if requested and current:
+                offset = int(requested[len("bytes="):].rstrip("-"))
+                if offset >= len(BODY):
+                    self._send(416, b"", {"Content-Range": f"bytes */{len(BODY)}"})
+                    return
+                headers = {"Content-Range": f"bytes {offset}-{len(BODY) - 1}/{len(BODY)}"}
+                self._send(206, BODY[offset:], headers)
+            else:
+                self._send(200, BODY, {})
+
+        def _send(self, status, body, headers):
+            state["statuses"].append(status)
+            self.send_response(status)
+            self.send_header("ETag", ETAG)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    state["base"] = f"http://127.0.0.1:{httpd.server_address[1]}/"
+    yield state
+    httpd.shutdown()
+
+
+def _config(server, tmp_path):
+    checksums = tmp_path / "sha1sums.txt"
+    digest = hashlib.sha1(BODY).hexdigest()
+    checksums.write_text(f"{digest}  bswiki-20250601-pages-articles.xml.bz2\n", encoding="utf-8")
+    return WikipediaDumpConfig(
+        url=server["base"],
+        dump_url=server["base"],
+        dump_file=FILE_NAME,
+        language="bs",
+        source="wikipedia_bs",
+        checksum_file=str(checksums),
+    )
+
+
+def _partial(cache_dir, content, if_range=None):
+    cache_dir.mkdir()
+    part = cache_dir / f"{FILE_NAME}.part"
+    part.write_bytes(content)
+    if if_range is not None:
+        validator = {"if_range": if_range, "size": len(BODY)}
+        (cache_dir / f"{FILE_NAME}.part.validator").write_text(json.dumps(validator))
+    return part
+
+
+def _download(server, tmp_path, cache_dir):
+    path = _download_file(_config(server, tmp_path), FILE_NAME, cache_dir, "test", LOGGER)
+    assert path.read_bytes() == BODY
+    assert sorted(item.name for item in cache_dir.iterdir()) == [FILE_NAME, f"{FILE_NAME}.verified"]
+    return server["statuses"]
+
+
+def test_resume_appends_when_validator_matches(tmp_path, server):
+    cache_dir = tmp_path / "cache"
+    _partial(cache_dir, BODY[:1000], ETAG)
+    assert _download(server, tmp_path, cache_dir) == [206]
+
+
+@pytest.mark.parametrize("if_range", ['"20250501"', None])
+def test_changed_or_unknown_dump_restarts_from_zero(tmp_path, server, if_range):
+    cache_dir = tmp_path / "cache"
+    _partial(cache_dir, b"x" * 1000, if_range)
+    assert _download(server, tmp_path, cache_dir) == [200]
+
+
+def test_416_with_wrong_size_restarts(tmp_path, server):
+    cache_dir = tmp_path / "cache"
+    _partial(cache_dir, b"x" * (len(BODY) + 10), ETAG)
+    assert _download(server, tmp_path, cache_dir) == [416, 200]
+
+
+def test_checksum_mismatch_after_resume_retries_from_scratch(tmp_path, server):
+    server["ignore_if_range"] = True
+    cache_dir = tmp_path / "cache"
+    _partial(cache_dir, b"x" * 1000, '"20250501"')
+    assert _download(server, tmp_path, cache_dir) == [206, 200]
@@ -1,13 +1,24 @@
 from utils.config import load_config
-from utils.hashing import sha256_text
+from utils.hashing import sha256_digest64, sha256_text
 from utils.logging import setup_logging
-from utils.text_utils import anonymize_text, contains_pii, normalize_text
+from utils.text_utils import (
+    TextStats,
+    anonymize_text,
+    contains_pii,
+    normalize_text,
+    text_stats,
+    text_stats_batch,
+)
 
 __all__ = [
+    "TextStats",
     "anonymize_text",
     "contains_pii",
     "load_config",
     "normalize_text",
+    "sha256_digest64",
     "sha256_text",
     "setup_logging",
+    "text_stats",
+    "text_stats_batch",
 ]
@@ -13,6 +13,11 @@ def sha256_text(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
+def sha256_digest64(text: str) -> int:
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
 def compute_minhash(tokens: Iterable[str], num_perm: int) -> "MinHash":
     if MinHash is None:
         raise RuntimeError("datasketch is required for MinHash deduplication")
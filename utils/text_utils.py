@@ -1,33 +1,209 @@
 from __future__ import annotations
 
 import re
-from typing import Iterable
+import string
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
 
 
 EMAIL_PATTERN = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
 PHONE_PATTERN = re.compile(r"\b(\+\d{3}|0)\d{8,10}\b")
-WHITESPACE_PATTERN = re.compile(r"\s+")
+PII_PATTERN = re.compile(
+    rf"(?P<email>{EMAIL_PATTERN.pattern})|(?P<phone>{PHONE_PATTERN.pattern})"
+)
+PII_REPLACEMENTS = {"email": "[EMAIL]", "phone": "[PHONE]"}
+QUOTE_REPLACEMENTS = {
+    "“": '"',
+    "”": '"',
+    "„": '"',
+    "«": '"',
+    "»": '"',
+    "‚": "'",
+    "‘": "'",
+    "’": "'",
+}
+DASH_REPLACEMENTS = {"–": "-", "—": "-", "‒": "-", "―": "-"}
+# Non-breaking spaces become plain spaces; soft hyphens and zero-width marks are dropped.
+SPACING_REPLACEMENTS = {
+    "\u00a0": " ",
+    "\u202f": " ",
+    "\u2007": " ",
+    "\u00ad": "",
+    "\u200b": "",
+    "\ufeff": "",
+}
+
+DIGIT = 1
+ALNUM = 2
+SPACE = 4
+PUNCT = 8
+PUNCTUATION_CHARS = frozenset(string.punctuation)
+# Concatenating texts only beats per-text stats while they stay short (~4k chars break-even).
+BATCH_STATS_MAX_CHARS = 2000
 
 
 def normalize_whitespace(text: str) -> str:
-    text = WHITESPACE_PATTERN.sub(" ", text)
-    return text.strip()
+    # str.split() splits on exactly the characters \s matches, and drops the ends.
+    return " ".join(text.split())
+
+
+@lru_cache(maxsize=8)
+def replacement_pairs(
+    quotes: bool = True, dashes: bool = True, spacing: bool = True
+) -> Tuple[Tuple[str, str], ...]:
+    replacements: Dict[str, str] = {}
+    if quotes:
+        replacements.update(QUOTE_REPLACEMENTS)
+    if dashes:
+        replacements.update(DASH_REPLACEMENTS)
+    if spacing:
+        replacements.update(SPACING_REPLACEMENTS)
+    return tuple(replacements.items())
+
+
+def replace_characters(text: str, pairs: Sequence[Tuple[str, str]]) -> str:
+    # Chained str.replace beats str.translate here: translate does a per-character mapping
+    # lookup on any non-ASCII text, while a replace with no occurrence is a fast C search.
+    for old, new in pairs:
+        if old in text:
+            text = text.replace(old, new)
+    return text
 
 
 def normalize_quotes(text: str) -> str:
-    return text.replace("“", '"').replace("”", '"').replace("„", '"')
+    return replace_characters(text, replacement_pairs(dashes=False, spacing=False))
 
 
 def normalize_dashes(text: str) -> str:
-    return text.replace("–", "-").replace("—", "-")
-
-
-def normalize_text(text: str, normalize_quotes_flag: bool = True, normalize_dashes_flag: bool = True) -> str:
-    if normalize_quotes_flag:
-        text = normalize_quotes(text)
-    if normalize_dashes_flag:
-        text = normalize_dashes(text)
-    return text
+    return replace_characters(text, replacement_pairs(quotes=False, spacing=False))
+
+
+def normalize_text(
+    text: str,
+    normalize_quotes_flag: bool = True,
+    normalize_dashes_flag: bool = True,
+    normalize_spacing_flag: bool = True,
+) -> str:
+    pairs = replacement_pairs(normalize_quotes_flag, normalize_dashes_flag, normalize_spacing_flag)
+    return replace_characters(text, pairs)
+
+
+@dataclass(frozen=True)
+class TextStats:
+    length: int
+    words: int
+    digits: int
+    specials: int
+    punctuation: int
+
+    @property
+    def digit_ratio(self) -> float:
+        return self.digits / self.length if self.length else 0.0
+
+    @property
+    def special_char_ratio(self) -> float:
+        return self.specials / self.length if self.length else 0.0
+
+    @property
+    def punctuation_ratio(self) -> float:
+        return self.punctuation / self.length if self.length else 0.0
+
+
+def _char_class(char: str) -> int:
+    flags = 0
+    if char.isdigit():
+        flags |= DIGIT
+    if char.isalnum():
+        flags |= ALNUM
+    if char.isspace():
+        flags |= SPACE
+    if char in PUNCTUATION_CHARS:
+        flags |= PUNCT
+    return flags
+
+
+@lru_cache(maxsize=1)
+def _bmp_classes() -> np.ndarray:
+    classes: np.ndarray = np.array(
+        [_char_class(chr(code)) for code in range(0x10000)], dtype=np.uint8
+    )
+    return classes
+
+
+def _classify(text: str) -> np.ndarray:
+    codes = np.frombuffer(text.encode("utf-32-le", errors="surrogatepass"), dtype="<u4")
+    classes: np.ndarray
+    if codes.max() <= 0xFFFF:
+        classes = _bmp_classes()[codes]
+        return classes
+    astral = codes > 0xFFFF
+    classes = _bmp_classes()[np.where(astral, 0, codes)]
+    classes[astral] = [_char_class(chr(code)) for code in codes[astral]]
+    return classes
+
+
+def _word_starts(classes: np.ndarray) -> np.ndarray:
+    space = (classes & SPACE).astype(bool)
+    previous_space = np.empty_like(space)
+    previous_space[:1] = True
+    previous_space[1:] = space[:-1]
+    starts: np.ndarray = ~space & previous_space
+    return starts
+
+
+def text_stats(text: str) -> TextStats:
+    if not text:
+        return TextStats(0, 0, 0, 0, 0)
+    classes = _classify(text)
+    return TextStats(
+        length=len(text),
+        words=int(np.count_nonzero(_word_starts(classes))),
+        digits=int(np.count_nonzero(classes & DIGIT)),
+        specials=int(np.count_nonzero((classes & (ALNUM | SPACE)) == 0)),
+        punctuation=int(np.count_nonzero(classes & PUNCT)),
+    )
+
+
+def text_stats_batch(texts: Sequence[str]) -> List[TextStats]:
+    short = [index for index, text in enumerate(texts) if len(text) < BATCH_STATS_MAX_CHARS]
+    if len(short) == len(texts):
+        return _concatenated_stats(texts)
+    stats = [text_stats(text) if len(text) >= BATCH_STATS_MAX_CHARS else None for text in texts]
+    for index, short_stats in zip(short, _concatenated_stats([texts[i] for i in short])):
+        stats[index] = short_stats
+    return [doc_stats for doc_stats in stats if doc_stats is not None]
+
+
+def _concatenated_stats(texts: Sequence[str]) -> List[TextStats]:
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+    if not lengths.sum():
+        return [TextStats(0, 0, 0, 0, 0) for _ in texts]
+
+    classes = _classify("".join(texts))
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    starts = _word_starts(classes)
+    # A word cannot continue across a document boundary.
+    starts[offsets[lengths > 0]] = (classes[offsets[lengths > 0]] & SPACE) == 0
+
+    indicators = (
+        starts,
+        (classes & DIGIT) != 0,
+        (classes & (ALNUM | SPACE)) == 0,
+        (classes & PUNCT) != 0,
+    )
+    nonempty = lengths > 0
+    counts = np.zeros((len(texts), len(indicators)), dtype=np.int64)
+    for column, indicator in enumerate(indicators):
+        counts[nonempty, column] = np.add.reduceat(
+            indicator.view(np.uint8), offsets[nonempty], dtype=np.int64
+        )
+    return [
+        TextStats(int(length), int(row[0]), int(row[1]), int(row[2]), int(row[3]))
+        for length, row in zip(lengths, counts)
+    ]
 
 
 def word_count(text: str) -> int:
@@ -35,27 +211,24 @@ def word_count(text: str) -> int:
 
 
 def digit_ratio(text: str) -> float:
-    if not text:
-        return 0.0
-    digits = sum(char.isdigit() for char in text)
-    return digits / len(text)
+    return text_stats(text).digit_ratio
 
 
 def special_char_ratio(text: str) -> float:
-    if not text:
-        return 0.0
-    specials = sum(not char.isalnum() and not char.isspace() for char in text)
-    return specials / len(text)
+    return text_stats(text).special_char_ratio
 
 
 def contains_pii(text: str) -> bool:
-    return bool(EMAIL_PATTERN.search(text) or PHONE_PATTERN.search(text))
+    return PII_PATTERN.search(text) is not None
+
+
+def _pii_replacement(match: re.Match) -> str:
+    group = match.lastgroup
+    return PII_REPLACEMENTS[group] if group else match.group(0)
 
 
 def anonymize_text(text: str) -> str:
-    text = EMAIL_PATTERN.sub("[EMAIL]", text)
-    text = PHONE_PATTERN.sub("[PHONE]", text)
-    return text
+    return PII_PATTERN.sub(_pii_replacement, text)
 
 
 def tokenize_for_minhash(text: str) -> Iterable[str]: